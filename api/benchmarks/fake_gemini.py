@@ -0,0 +1,136 @@
+# api/benchmarks/fake_gemini.py - Local stand-in for a Gemini GenerativeModel
+"""A fake google.generativeai GenerativeModel for load tests.
+
+It answers analysis prompts (single-claim and micro-batched) after a sampled
+latency. It can also fail a configured fraction of calls, or reply with text
+that holds no usable JSON. It never touches the network.
+"""
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Optional
+
+_AMOUNT = re.compile(r"Claimed Amount: \$([0-9.]+)")
+_BATCH_CLAIM = re.compile(r"^Claim (\d+):", re.M)
+_SCORE = re.compile(r"Fraud Risk Score: ([0-9.]+)/100")
+
+MALFORMED_REPLIES = (
+    "I'm sorry, I can't help with that claim.",
+    '```json\n{"validity": "questionable", "recommendation": "manual_review", "estimated_payout": 12',
+    "Validity: questionable. Recommendation: manual review.",
+)
+
+
+class FakeGeminiError(Exception):
+    """Raised for calls the fake fails on purpose (stands in for 429s and 5xx)"""
+
+
+def latency_sampler(spec: str) -> Callable[[random.Random], float]:
+    """Parse a latency spec into a sampler returning seconds.
+
+    Specs are in milliseconds: "fixed:800", "uniform:200:1500", or
+    "lognormal:800:0.5" (median and sigma).
+    """
+    kind, _, rest = spec.partition(":")
+    try:
+        args = [float(part) for part in rest.split(":")] if rest else []
+    except ValueError:
+        raise ValueError(f"Bad latency spec: {spec!r}") from None
+    if kind == "fixed" and len(args) == 1:
+        return lambda rng: args[0] / 1000.0
+    if kind == "uniform" and len(args) == 2:
+        return lambda rng: rng.uniform(args[0], args[1]) / 1000.0
+    if kind == "lognormal" and len(args) == 2:
+        mu = math.log(args[0])
+        return lambda rng: rng.lognormvariate(mu, args[1]) / 1000.0
+    raise ValueError(f"Bad latency spec: {spec!r}")
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGenerativeModel:
+    """Implements generate_content and generate_content_async like the SDK model"""
+
+    def __init__(self, latency: str = "lognormal:800:0.5", error_rate: float = 0.0,
+                 malformed_rate: float = 0.0, seed: Optional[int] = None):
+        self.sample_latency = latency_sampler(latency)
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.malformed = 0
+
+    def _plan(self, prompt: str):
+        # One draw per call so results only depend on the seed and call order
+        with self._lock:
+            self.calls += 1
+            delay = self.sample_latency(self._rng)
+            roll = self._rng.random()
+            if roll < self.error_rate:
+                self.errors += 1
+                return delay, None
+            if roll < self.error_rate + self.malformed_rate:
+                self.malformed += 1
+                return delay, self._rng.choice(MALFORMED_REPLIES)
+            return delay, reply_for(prompt, self._rng)
+
+    async def generate_content_async(self, prompt: str, **kwargs: Any) -> _Response:
+        delay, text = self._plan(prompt)
+        await asyncio.sleep(delay)
+        if text is None:
+            raise FakeGeminiError("429 Resource has been exhausted (fake)")
+        return _Response(text)
+
+    def generate_content(self, prompt: str, **kwargs: Any) -> _Response:
+        delay, text = self._plan(prompt)
+        time.sleep(delay)
+        if text is None:
+            raise FakeGeminiError("429 Resource has been exhausted (fake)")
+        return _Response(text)
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "errors": self.errors, "malformed": self.malformed}
+
+
+def _analysis(amount: float, score: float, rng: random.Random) -> dict:
+    if score >= 60:
+        validity, recommendation = "questionable", "manual_review"
+    elif score >= 30:
+        validity, recommendation = rng.choice((("valid", "manual_review"), ("questionable", "manual_review")))
+    else:
+        validity, recommendation = "valid", "auto_approve"
+    return {
+        "validity": validity,
+        "recommendation": recommendation,
+        "estimated_payout": round(amount * rng.uniform(0.6, 1.0), 2),
+        "red_flags": [] if score < 30 else ["Elevated fraud score"],
+        "reasoning": "Details are consistent with the reported damage.",
+    }
+
+
+def _section_analysis(section: str, rng: random.Random) -> dict:
+    amount = _AMOUNT.search(section)
+    score = _SCORE.search(section)
+    return _analysis(float(amount.group(1).rstrip(".")) if amount else 0.0,
+                     float(score.group(1)) if score else 0.0, rng)
+
+
+def reply_for(prompt: str, rng: random.Random) -> str:
+    """A well-formed reply shaped like Gemini's for the given analysis prompt"""
+    starts = list(_BATCH_CLAIM.finditer(prompt))
+    if not starts:
+        return "```json\n" + json.dumps(_section_analysis(prompt, rng), indent=4) + "\n```"
+    items = []
+    for position, match in enumerate(starts):
+        end = starts[position + 1].start() if position + 1 < len(starts) else len(prompt)
+        items.append(dict(index=int(match.group(1)), **_section_analysis(prompt[match.start():end], rng)))
+    return json.dumps(items)
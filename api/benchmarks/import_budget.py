@@ -0,0 +1,65 @@
+# api/benchmarks/import_budget.py - Fail when app import (cold start) exceeds its budget
+"""Run from api/: python benchmarks/import_budget.py
+
+Imports main in fresh interpreters and exits non-zero when the median import
+time exceeds IMPORT_BUDGET_MS, or when a module that must stay lazy (the Gemini
+SDK, NumPy) is loaded at startup.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1000"))
+IMPORT_BUDGET_RUNS = int(os.getenv("IMPORT_BUDGET_RUNS", "5"))
+
+# Only needed once a request actually calls the LLM or bulk-scores claims
+LAZY_MODULES = ("google.generativeai", "numpy")
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({"ms": elapsed * 1000, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+def measure_once(workdir: str) -> dict:
+    env = dict(os.environ)
+    # Exercise the configured-LLM startup path without touching real state
+    env.setdefault("GEMINI_API_KEY", "import-budget")
+    env["CLAIM_STORE_DB"] = os.path.join(workdir, "claims.db")
+    env["JOB_STORE"] = "memory"
+    env.pop("LLM_CACHE_DB", None)
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=API_DIR, env=env,
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as workdir:
+        runs = [measure_once(workdir) for _ in range(IMPORT_BUDGET_RUNS)]
+
+    median_ms = statistics.median(run["ms"] for run in runs)
+    loaded = sorted({module for run in runs for module in run["loaded"]})
+    print(f"import main: median {median_ms:.0f} ms over {len(runs)} runs (budget {IMPORT_BUDGET_MS:.0f} ms)")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: modules that must load lazily were imported at startup: {', '.join(loaded)}")
+        failed = True
+    if median_ms > IMPORT_BUDGET_MS:
+        print("FAIL: cold-start import time is over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# api/benchmarks/load_test.py - Load driver for /api/claims/analyze against a fake Gemini
+"""Run from api/: python benchmarks/load_test.py [--requests N] [--concurrency C]
+
+Drives the app in-process (through httpx's ASGI transport, so no sockets)
+with synthetic claims. Gemini is replaced by FakeGenerativeModel with the
+chosen latency distribution, error rate and malformed-reply rate. Pass --url
+to load a running server instead; the fake only applies in-process.
+
+Reports throughput, p50/p95/p99 latency, non-200 rate and the share of claims
+that fell back to rules. Results are written as JSON (--output). Pass
+--compare with an earlier result file to print the change between commits.
+Needs httpx.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from fake_gemini import FakeGenerativeModel
+from synthetic_claims import iter_claims
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANALYZE_PATH = "/api/claims/analyze"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=API_DIR,
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def in_process_client(args: argparse.Namespace, workdir: str):
+    """An httpx client wired to the app, with Gemini replaced by the fake"""
+    import httpx
+
+    # Exercise the configured-LLM path without quota limits or real state
+    os.environ.setdefault("GEMINI_API_KEY", "load-test")
+    os.environ.setdefault("LLM_RATE_RPM", "0")
+    os.environ["CLAIM_STORE_DB"] = os.path.join(workdir, "claims.db")
+    os.environ["JOB_STORE"] = "memory"
+    os.environ.pop("LLM_CACHE_DB", None)
+    sys.path.insert(0, API_DIR)
+    import main
+
+    fake = FakeGenerativeModel(args.latency, args.error_rate, args.malformed_rate, seed=args.seed)
+    # A loaded model means the Gemini SDK is never imported
+    main.llm.model = fake
+    # Unhandled app errors come back as 500s and count against the run
+    transport = httpx.ASGITransport(app=main.app, raise_app_exceptions=False)
+    client = httpx.AsyncClient(transport=transport, base_url="http://load-test")
+    return client, fake
+
+
+async def drive(client: Any, total: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    claims = iter_claims(seed)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    paths: Counter = Counter()
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            payload = {"incidentData": next(claims)}
+            started = time.perf_counter()
+            response = await client.post(ANALYZE_PATH, json=payload)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+            if response.status_code == 200:
+                paths[response.json()["ai_analysis"]["analysis_path"]] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ok = statuses.get(200, 0)
+    return {
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        },
+        "error_rate": round(1 - ok / total, 4) if total else 0.0,
+        "fallback_rate": round(paths.get("fallback", 0) / ok, 4) if ok else 0.0,
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "analysis_paths": dict(sorted(paths.items())),
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    def change(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    print(f"vs {baseline.get('commit') or 'baseline'}:")
+    print(f"  throughput {baseline['throughput_rps']} -> {result['throughput_rps']} req/s "
+          f"({change(result['throughput_rps'], baseline['throughput_rps'])})")
+    for name in ("p50", "p95", "p99"):
+        old, new = baseline["latency_ms"][name], result["latency_ms"][name]
+        print(f"  {name} {old} -> {new} ms ({change(new, old)})")
+    print(f"  fallback rate {baseline['fallback_rate']} -> {result['fallback_rate']}")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as workdir:
+        fake = None
+        if args.url:
+            import httpx
+            client = httpx.AsyncClient(base_url=args.url, timeout=None)
+        else:
+            client, fake = in_process_client(args, workdir)
+        async with client:
+            if args.warmup:
+                await drive(client, args.warmup, args.concurrency, seed=args.seed + 1)
+            result = await drive(client, args.requests, args.concurrency, seed=args.seed)
+
+    result["fake_gemini"] = fake.stats() if fake is not None else None
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--warmup", type=int, default=100, help="requests sent before measuring")
+    parser.add_argument("--latency", default="lognormal:800:0.5",
+                        help='fake Gemini latency in ms: "fixed:MS", "uniform:LO:HI" or "lognormal:MEDIAN:SIGMA"')
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of fake Gemini calls that fail")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="fraction of fake Gemini replies without usable JSON")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="load a running server instead of the in-process app")
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    report = {
+        "commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        **result,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    latency = report["latency_ms"]
+    print(f"{report['requests']} requests in {report['elapsed_s']} s: {report['throughput_rps']} req/s")
+    print(f"latency p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms")
+    print(f"error rate {report['error_rate']}, fallback rate {report['fallback_rate']}, "
+          f"paths {report['analysis_paths']}")
+    print(f"results written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# api/benchmarks/synthetic_claims.py - Seeded generator of realistic claim payloads
+"""Synthetic IncidentData payloads for load tests and microbenchmarks.
+
+The field mix is set by the module constants below. Tune them to match
+production; the defaults follow the shape of the claims seen so far. Those
+are mostly small auto and property claims with a long tail of large amounts
+and a minority of short or very long descriptions.
+"""
+import datetime
+import random
+from typing import Any, Dict, Iterator, List, Optional
+
+# Claimed amount: log-normal around the median, clipped to the range
+AMOUNT_MEDIAN = 4500.0
+AMOUNT_SIGMA = 1.1
+AMOUNT_MAX = 250000.0
+AMOUNT_MISSING_RATE = 0.03
+
+INJURY_RATE = 0.22
+PROPERTY_DAMAGE_RATE = 0.78
+HIGH_RISK_RATE = 0.12
+VAGUE_LOCATION_RATE = 0.02
+# Share of short (< 50 characters), typical and very long descriptions
+DESCRIPTION_MIX = (("short", 0.15), ("typical", 0.75), ("long", 0.10))
+# Incidents spread over this many days before DATE_END, weighted toward daytime
+DATE_SPAN_DAYS = 730
+DATE_END = datetime.datetime(2025, 12, 31, 23, 59)
+HOUR_WEIGHTS = (1, 1, 1, 1, 1, 2, 3, 5, 7, 7, 6, 6, 7, 7, 7, 8, 9, 9, 7, 5, 4, 3, 2, 1)
+
+CITIES = (
+    "Toronto, ON", "Mississauga, ON", "Ottawa, ON", "Montreal, QC", "Vancouver, BC",
+    "Calgary, AB", "Edmonton, AB", "Winnipeg, MB", "Halifax, NS", "Regina, SK",
+    "Seattle, WA", "Buffalo, NY", "Detroit, MI", "Chicago, IL", "Boston, MA",
+)
+STREETS = ("King St W", "Queen St E", "Main St", "Yonge St", "Highway 401", "Bloor St",
+           "Elm Ave", "Maple Dr", "Lakeshore Blvd", "Oak Rd")
+VAGUE_LOCATIONS = ("N/A", "home", "road", "?")
+
+SHORT_DESCRIPTIONS = (
+    "Minor fender bender.", "Hail damage to roof.", "Rear-ended at light.",
+    "Broken window.", "Water leak in basement.", "Scratched bumper in lot.",
+)
+EVENTS = (
+    "My vehicle was rear-ended while stopped at a red light",
+    "Another driver changed lanes without signalling and hit my front bumper",
+    "A tree branch fell on the car during a storm",
+    "A pipe burst in the upstairs bathroom and water came through the ceiling",
+    "I backed into a pole in the parking garage",
+    "Hail dented the hood and cracked the windshield",
+    "A delivery truck clipped my side mirror while parked",
+)
+HIGH_RISK_EVENTS = (
+    "The car was stolen overnight from the driveway",
+    "A fire started in the garage and spread to the kitchen",
+    "The basement flooded after heavy rain and everything is a total loss",
+)
+DETAILS = (
+    "The other driver provided insurance details at the scene.",
+    "Police attended and a report number was issued.",
+    "Photos of the damage were taken immediately afterwards.",
+    "A repair shop has provided a written estimate.",
+    "There were two witnesses who stayed to give statements.",
+    "The damage is limited to the rear bumper and trunk lid.",
+    "I was driving home from work at the time.",
+    "The contractor said the drywall and flooring need replacing.",
+    "Nobody else was in the vehicle.",
+    "I reported the incident to the property manager the same day.",
+)
+
+
+def _weighted(rng: random.Random, choices) -> Any:
+    return rng.choices([value for value, _ in choices], [weight for _, weight in choices])[0]
+
+
+def generate_description(rng: random.Random, kind: str, high_risk: bool = False) -> str:
+    """A description of the given kind: "short", "typical" or "long" (several kB)"""
+    if kind == "short" and not high_risk:
+        return rng.choice(SHORT_DESCRIPTIONS)
+    event = rng.choice(HIGH_RISK_EVENTS if high_risk else EVENTS)
+    if kind == "short":
+        return event + "."
+    count = rng.randint(1, 4) if kind == "typical" else rng.randint(40, 80)
+    return " ".join([event + "."] + [rng.choice(DETAILS) for _ in range(count)])
+
+
+def generate_claim(rng: random.Random) -> Dict[str, Any]:
+    """One IncidentData payload, as the frontend would send it"""
+    start = DATE_END - datetime.timedelta(days=DATE_SPAN_DAYS)
+    day = start + datetime.timedelta(days=rng.randrange(DATE_SPAN_DAYS))
+    moment = day.replace(hour=rng.choices(range(24), HOUR_WEIGHTS)[0], minute=rng.randrange(60))
+
+    if rng.random() < VAGUE_LOCATION_RATE:
+        location = rng.choice(VAGUE_LOCATIONS)
+    else:
+        location = f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}"
+
+    amount: Optional[float] = None
+    if rng.random() >= AMOUNT_MISSING_RATE:
+        amount = round(min(AMOUNT_MAX, rng.lognormvariate(0, AMOUNT_SIGMA) * AMOUNT_MEDIAN), 2)
+
+    return {
+        "location": location,
+        "dateTime": moment.strftime("%Y-%m-%dT%H:%M"),
+        "description": generate_description(
+            rng, _weighted(rng, DESCRIPTION_MIX), high_risk=rng.random() < HIGH_RISK_RATE
+        ),
+        "injuries": rng.random() < INJURY_RATE,
+        "propertyDamage": rng.random() < PROPERTY_DAMAGE_RATE,
+        "claimedAmount": amount,
+    }
+
+
+def iter_claims(seed: int = 0) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    while True:
+        yield generate_claim(rng)
+
+
+def generate_claims(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    claims = iter_claims(seed)
+    return [next(claims) for _ in range(count)]
@@ -0,0 +1,210 @@
+# api/bulk_scoring.py - Vectorized NumPy fraud scoring for backfills and re-scoring
+import operator
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import IncidentData, FraudScore
+from rule_engine import FEATURES, RuleError, RuleSet
+from scoring import extract_features, fraud_rules, fraud_calendar
+from holiday_calendar import HOLIDAY, HolidayCalendar, parse_timestamp
+
+_COMPARISONS = {
+    ">": operator.gt, ">=": operator.ge, "<": operator.lt,
+    "<=": operator.le, "==": operator.eq, "!=": operator.ne,
+}
+_DTYPES = {
+    "claimed_amount": np.float64,
+    "description_length": np.int64,
+    "high_risk_keyword": np.float64,
+    "weekday": np.int8,
+    "injuries": bool,
+    "property_damage": bool,
+    "location_length": np.int64,
+    "holiday": bool,
+    "after_hours": bool,
+}
+
+
+class ClaimColumns(NamedTuple):
+    """Columnar view of many incidents, one array per rule_engine feature"""
+    amounts: np.ndarray
+    description_lengths: np.ndarray
+    keyword_hits: np.ndarray
+    weekdays: np.ndarray  # -1 when dateTime is unparseable
+    injuries: np.ndarray
+    property_damage: np.ndarray
+    location_lengths: np.ndarray
+    holidays: np.ndarray
+    after_hours: np.ndarray
+
+
+class BulkScores(NamedTuple):
+    scores: np.ndarray
+    risk_levels: np.ndarray  # index into rule_set.risk_bands
+    confidences: np.ndarray
+    fired: np.ndarray  # (claims, rules) bool; column i is rule_set.indicators[i]
+    rule_set: RuleSet
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+
+def extract_columns(incidents: Iterable[IncidentData]) -> ClaimColumns:
+    """Flatten incidents into the column arrays score_columns expects"""
+    rows = [extract_features(incident) for incident in incidents]
+    columns = zip(*rows) if rows else [()] * len(FEATURES)
+    return ClaimColumns(*(
+        np.fromiter(values, dtype=_DTYPES[feature], count=len(rows))
+        for feature, values in zip(FEATURES, columns)
+    ))
+
+
+def calendar_columns(
+    ordinals: np.ndarray,
+    minutes: np.ndarray,
+    regions: Sequence[Optional[str]],
+    calendar: Optional[HolidayCalendar] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(weekdays, holidays, after_hours) columns from parsed timestamps.
+
+    ordinals are date ordinals (0 when unparseable) and minutes are minutes of
+    the day (-1 when unknown), as parse_timestamp returns them. Flags come from
+    one gather over the calendar's per-region tables.
+    """
+    calendar = calendar or fraud_calendar
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    minutes = np.asarray(minutes, dtype=np.int64)
+    parsed = ordinals > 0
+    weekdays = np.where(parsed, (ordinals - 1) % 7, -1).astype(np.int8)
+
+    row_of = {region: row for row, region in enumerate(dict.fromkeys([None, *regions]))}
+    tables = np.stack([np.frombuffer(calendar.table(region), dtype=np.uint8) for region in row_of])
+    rows = np.fromiter((row_of[region] for region in regions), dtype=np.intp, count=len(ordinals))
+    index = ordinals - calendar.first_ordinal
+    covered = parsed & (index >= 0) & (index < calendar.days)
+    flags = np.zeros(len(ordinals), dtype=np.uint8)
+    flags[covered] = tables[rows[covered], index[covered]]
+    holidays = (flags & HOLIDAY) != 0
+
+    start, end = calendar.after_hours_start, calendar.after_hours_end
+    if start > end:
+        after_hours = (minutes >= start) | ((minutes >= 0) & (minutes < end))
+    else:
+        after_hours = (minutes >= start) & (minutes < end)
+    return weekdays, holidays, after_hours
+
+
+def timing_columns(date_times: Sequence[str], locations: Sequence[str],
+                   calendar: Optional[HolidayCalendar] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """calendar_columns for raw dateTime and location strings"""
+    calendar = calendar or fraud_calendar
+    parsed = [parse_timestamp(date_time) or (0, -1) for date_time in date_times]
+    ordinals = np.fromiter((ordinal for ordinal, _ in parsed), dtype=np.int64, count=len(parsed))
+    minutes = np.fromiter((minute for _, minute in parsed), dtype=np.int64, count=len(parsed))
+    return calendar_columns(ordinals, minutes, [calendar.region_of(location) for location in locations], calendar)
+
+
+def condition_mask(when: Dict[str, Any], columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Evaluate a rule condition over whole columns (mirrors rule_engine.condition_source)"""
+    if "all" in when:
+        return np.logical_and.reduce([condition_mask(part, columns) for part in when["all"]])
+    if "any" in when:
+        return np.logical_or.reduce([condition_mask(part, columns) for part in when["any"]])
+    if "not" in when:
+        return ~condition_mask(when["not"], columns)
+
+    column = columns[when["feature"]]
+    op = when["op"]
+    if op == "is_true":
+        return column.astype(bool)
+    if op == "is_false":
+        return ~column.astype(bool)
+    if op in _COMPARISONS:
+        return _COMPARISONS[op](column, when["value"])
+    if op == "in":
+        return np.isin(column, when["value"])
+    if op == "not_in":
+        return ~np.isin(column, when["value"])
+    raise RuleError(f"Unknown operator: {op!r}")
+
+
+def score_columns(
+    amounts: np.ndarray,
+    description_lengths: np.ndarray,
+    keyword_hits: np.ndarray,
+    weekdays: np.ndarray,
+    injuries: np.ndarray,
+    property_damage: np.ndarray,
+    location_lengths: np.ndarray,
+    holidays: np.ndarray,
+    after_hours: np.ndarray,
+    rule_set: Optional[RuleSet] = None,
+) -> BulkScores:
+    """Score many claims at once; results match calculate_fraud_score element-wise"""
+    rule_set = rule_set or fraud_rules.rule_set
+    values = (amounts, description_lengths, keyword_hits, weekdays,
+              injuries, property_damage, location_lengths, holidays, after_hours)
+    columns = {
+        feature: np.asarray(column, dtype=_DTYPES[feature])
+        for feature, column in zip(FEATURES, values)
+    }
+    n = len(columns["claimed_amount"])
+
+    scores = np.zeros(n, dtype=np.float64)
+    # One column per rule, so any number of rules fits (no 64-bit mask limit)
+    fired = np.zeros((n, len(rule_set.ordered_rules)), dtype=bool)
+    column = 0
+    for block in rule_set.blocks:
+        # Within a group only the first matching rule fires, as in an if/elif chain
+        taken = np.zeros(n, dtype=bool)
+        for rule in block:
+            matched = condition_mask(rule.when, columns) & ~taken
+            taken |= matched
+            scores += matched * rule.weight
+            fired[:, column] = matched
+            column += 1
+
+    np.minimum(scores, rule_set.max_score, out=scores)
+    scores = np.round(scores, 2)
+
+    bands = rule_set.risk_bands
+    risk_levels = np.full(n, len(bands) - 1, dtype=np.int16)
+    for index in range(len(bands) - 2, -1, -1):
+        risk_levels[scores < bands[index].below] = index
+    confidences = np.array([band.confidence for band in bands])[risk_levels]
+
+    return BulkScores(
+        scores=scores,
+        risk_levels=risk_levels,
+        confidences=confidences,
+        fired=fired,
+        rule_set=rule_set,
+    )
+
+
+def indicators_from_row(row: np.ndarray, rule_set: RuleSet) -> List[str]:
+    """Indicator labels of one claim's row of BulkScores.fired"""
+    return [rule_set.indicators[column] for column in np.flatnonzero(row)]
+
+
+def to_fraud_scores(bulk: BulkScores) -> List[FraudScore]:
+    """Materialize FraudScore models (only needed when handing results to the API layer)"""
+    bands = bulk.rule_set.risk_bands
+    return [
+        FraudScore(
+            score=score,
+            risk_level=bands[level].level,
+            indicators=indicators_from_row(row, bulk.rule_set),
+            confidence=confidence,
+        )
+        for score, level, confidence, row in zip(
+            bulk.scores.tolist(), bulk.risk_levels.tolist(),
+            bulk.confidences.tolist(), bulk.fired,
+        )
+    ]
+
+
+def score_incidents(incidents: Iterable[IncidentData], rule_set: Optional[RuleSet] = None) -> BulkScores:
+    rule_set = rule_set or fraud_rules.rule_set
+    return score_columns(*extract_columns(incidents), rule_set=rule_set)
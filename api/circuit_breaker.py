@@ -0,0 +1,144 @@
+# api/circuit_breaker.py - Circuit breaker and adaptive deadline for LLM calls
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+LLM_CB_WINDOW_SECONDS = float(os.getenv("LLM_CB_WINDOW_SECONDS", "60"))
+LLM_CB_MIN_CALLS = int(os.getenv("LLM_CB_MIN_CALLS", "10"))
+LLM_CB_ERROR_RATE = float(os.getenv("LLM_CB_ERROR_RATE", "0.5"))
+LLM_CB_OPEN_SECONDS = float(os.getenv("LLM_CB_OPEN_SECONDS", "30"))
+LLM_CB_HALF_OPEN_PROBES = int(os.getenv("LLM_CB_HALF_OPEN_PROBES", "1"))
+LLM_TIMEOUT_MIN = float(os.getenv("LLM_TIMEOUT_MIN", "2"))
+LLM_TIMEOUT_MAX = float(os.getenv("LLM_TIMEOUT_MAX", "30"))
+LLM_TIMEOUT_P99_MULTIPLIER = float(os.getenv("LLM_TIMEOUT_P99_MULTIPLIER", "1.5"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Latency samples needed before the deadline adapts (until then LLM_TIMEOUT_MAX applies)
+_MIN_LATENCY_SAMPLES = 20
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the LLM while the breaker is open"""
+
+
+class CircuitBreaker:
+    """Trips on the error rate over a rolling time window.
+
+    While open, calls are refused immediately. After open_seconds the breaker
+    goes half-open and lets a few probe calls through: one success closes it,
+    one failure re-opens it. deadline() is the per-call timeout, derived from
+    the p99 of recent successful latencies.
+    """
+
+    def __init__(self, window_seconds: float = LLM_CB_WINDOW_SECONDS,
+                 min_calls: int = LLM_CB_MIN_CALLS,
+                 error_rate: float = LLM_CB_ERROR_RATE,
+                 open_seconds: float = LLM_CB_OPEN_SECONDS,
+                 half_open_probes: int = LLM_CB_HALF_OPEN_PROBES,
+                 timeout_min: float = LLM_TIMEOUT_MIN,
+                 timeout_max: float = LLM_TIMEOUT_MAX,
+                 p99_multiplier: float = LLM_TIMEOUT_P99_MULTIPLIER,
+                 latency_samples: int = 500,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self.timeout_min = timeout_min
+        self.timeout_max = timeout_max
+        self.p99_multiplier = p99_multiplier
+        self._clock = clock
+
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (timestamp, failed)
+        self._failures = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_samples)
+        self._deadline = timeout_max
+        self.trips = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Ask permission for one call; every allowed call must be followed by record_*"""
+        if self.state == OPEN:
+            if self._clock() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self._probes_in_flight = 0
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_probes:
+                self.rejected += 1
+                return False
+            self._probes_in_flight += 1
+        return True
+
+    def record_success(self, latency: float) -> None:
+        self._latencies.append(latency)
+        self._update_deadline()
+        if self.state == HALF_OPEN:
+            self._close()
+            return
+        self._record(failed=False)
+
+    def record_failure(self) -> None:
+        if self.state == HALF_OPEN:
+            self._trip()
+            return
+        self._record(failed=True)
+        calls = len(self._outcomes)
+        if (self.state == CLOSED and calls >= self.min_calls
+                and self._failures / calls >= self.error_rate):
+            self._trip()
+
+    def record_cancelled(self) -> None:
+        """The caller gave up before an outcome; frees a half-open probe slot"""
+        if self.state == HALF_OPEN and self._probes_in_flight:
+            self._probes_in_flight -= 1
+
+    def deadline(self) -> float:
+        return self._deadline
+
+    def _record(self, failed: bool) -> None:
+        now = self._clock()
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._failures -= self._outcomes.popleft()[1]
+
+    def _update_deadline(self) -> None:
+        if len(self._latencies) < _MIN_LATENCY_SAMPLES:
+            return
+        ordered = sorted(self._latencies)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        self._deadline = min(self.timeout_max, max(self.timeout_min, p99 * self.p99_multiplier))
+
+    def _trip(self) -> None:
+        self.state = OPEN
+        self._opened_at = self._clock()
+        self._probes_in_flight = 0
+        self.trips += 1
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self._probes_in_flight = 0
+        self._outcomes.clear()
+        self._failures = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        calls = len(self._outcomes)
+        return {
+            "state": self.state,
+            "calls_in_window": calls,
+            "error_rate": round(self._failures / calls, 4) if calls else 0.0,
+            "deadline_seconds": round(self._deadline, 3),
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,73 @@
+# api/claim_ids.py - Collision-free, time-sortable claim IDs
+import itertools
+import os
+import time
+from typing import Optional
+
+CLAIM_ID_PREFIX = "CLM-"
+# Optional fixed node ID (0 .. 2**40-1); by default each process picks a random one
+CLAIM_ID_NODE = os.getenv("CLAIM_ID_NODE", "")
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# Every 10-bit value as two Crockford base32 characters
+_PAIRS = [_CROCKFORD[i >> 5] + _CROCKFORD[i & 31] for i in range(1024)]
+_MASK_40 = (1 << 40) - 1
+
+
+def _encode_40(value: int) -> str:
+    return (
+        _PAIRS[value >> 30 & 1023] + _PAIRS[value >> 20 & 1023]
+        + _PAIRS[value >> 10 & 1023] + _PAIRS[value & 1023]
+    )
+
+
+def _encode_time(ms: int) -> str:
+    # 48-bit millisecond timestamp as 10 characters, as in ULID
+    return _CROCKFORD[ms >> 45 & 31] + _CROCKFORD[ms >> 40 & 31] + _encode_40(ms & _MASK_40)
+
+
+class ClaimIdGenerator:
+    """ULID-layout IDs: 48-bit ms timestamp + 40-bit node + 40-bit sequence.
+
+    The sequence comes from itertools.count, which is atomic under the GIL, so
+    generation needs no lock. IDs are monotonic within a process (the clock
+    never steps backwards) and sort by creation time across processes. The
+    random node keeps serverless instances from colliding without coordination.
+    """
+
+    def __init__(self, prefix: str = CLAIM_ID_PREFIX, node: Optional[int] = None):
+        self.prefix = prefix
+        self._fixed_node = node
+        self._reset()
+        if node is None and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        node = self._fixed_node
+        if node is None:
+            node = int.from_bytes(os.urandom(5), "big")
+        self._node_chars = _encode_40(node & _MASK_40)
+        self._sequence = itertools.count(int.from_bytes(os.urandom(4), "big"))
+        self._last_ms = 0
+        self._time_chars = _encode_time(0)
+
+    def __call__(self) -> str:
+        ms = time.time_ns() // 1_000_000
+        if ms > self._last_ms:
+            self._last_ms = ms
+            self._time_chars = _encode_time(ms)
+        return (
+            self.prefix + self._time_chars + self._node_chars
+            + _encode_40(next(self._sequence) & _MASK_40)
+        )
+
+
+def decode_timestamp_ms(claim_id: str, prefix: str = CLAIM_ID_PREFIX) -> int:
+    """Recover the creation time (ms since epoch) embedded in a claim ID"""
+    ms = 0
+    for char in claim_id[len(prefix):len(prefix) + 10]:
+        ms = ms << 5 | _CROCKFORD.index(char)
+    return ms
+
+
+new_claim_id = ClaimIdGenerator(node=int(CLAIM_ID_NODE) if CLAIM_ID_NODE else None)
@@ -0,0 +1,288 @@
+# api/claim_store.py - Persistent claim store with write-behind batching
+import asyncio
+import atexit
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from dashboard_stats import merge_rollups
+from models import ClaimAnalysisRequest, ClaimAnalysisResponse, StoredClaim
+
+# Serverless platforms only allow writes under the temp dir; point this at a
+# shared volume for history that outlives the instance
+CLAIM_STORE_DB = os.getenv("CLAIM_STORE_DB", os.path.join(tempfile.gettempdir(), "cortex-claims.db"))
+CLAIM_STORE_BATCH_SIZE = int(os.getenv("CLAIM_STORE_BATCH_SIZE", "500"))
+CLAIM_STORE_FLUSH_INTERVAL = float(os.getenv("CLAIM_STORE_FLUSH_INTERVAL", "0.05"))
+CLAIM_STORE_QUEUE_SIZE = int(os.getenv("CLAIM_STORE_QUEUE_SIZE", "100000"))
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS claims ("
+    " claim_id TEXT PRIMARY KEY,"
+    " policy_id TEXT,"
+    " status TEXT NOT NULL,"
+    " risk_level TEXT NOT NULL,"
+    " fraud_score REAL NOT NULL,"
+    " created_at TEXT NOT NULL,"
+    " request TEXT NOT NULL,"
+    " response TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_created ON claims (created_at, claim_id)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_policy ON claims (policy_id, created_at, claim_id)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_status ON claims (status, created_at, claim_id)",
+    "CREATE TABLE IF NOT EXISTS claim_rollups ("
+    " metric TEXT PRIMARY KEY,"
+    " value REAL NOT NULL)",
+)
+
+_STOP = object()
+
+T = TypeVar("T")
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class ClaimStore:
+    """SQLite (WAL) claim store.
+
+    record() only enqueues; a background thread groups queued claims into one
+    transaction per batch, so persistence never blocks the request path.
+    Reads run on a second background thread: get(), list() and load_rollups()
+    are awaited.
+    Claims still waiting in the queue are served from memory by get().
+
+    The database is opened on first use rather than at import. If it cannot
+    be opened the store disables itself: claims are dropped, reads come back
+    empty, and the API keeps serving.
+    """
+
+    def __init__(self, path: str = CLAIM_STORE_DB, batch_size: int = CLAIM_STORE_BATCH_SIZE,
+                 flush_interval: float = CLAIM_STORE_FLUSH_INTERVAL,
+                 queue_size: int = CLAIM_STORE_QUEUE_SIZE):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._open_lock = threading.Lock()
+        self.disabled = False
+        self._read_lock = threading.Lock()
+        self._read_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="claim-store-reads")
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=queue_size)
+        self._pending: Dict[str, StoredClaim] = {}
+        self._pending_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+
+    def record(self, request: ClaimAnalysisRequest, response: ClaimAnalysisResponse,
+               replaces: Optional[ClaimAnalysisResponse] = None) -> bool:
+        """Queue a claim for persistence; returns False if the queue is full or the store is disabled.
+
+        Pass replaces when overwriting a claim already recorded, so its rollups are not counted twice.
+        """
+        if self._connection() is None:
+            self.dropped += 1
+            return False
+        self._ensure_writer()
+        claim = StoredClaim(request=request, response=response)
+        with self._pending_lock:
+            self._pending[response.claim_id] = claim
+        try:
+            self._queue.put_nowait((claim, replaces))
+        except queue.Full:
+            with self._pending_lock:
+                self._pending.pop(response.claim_id, None)
+            self.dropped += 1
+            return False
+        return True
+
+    async def _read(self, fn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._read_executor, fn, *args)
+
+    async def get(self, claim_id: str) -> Optional[StoredClaim]:
+        claim = self._pending.get(claim_id)
+        if claim is not None:
+            return claim
+        return await self._read(self._get, claim_id)
+
+    def _get(self, claim_id: str) -> Optional[StoredClaim]:
+        conn = self._connection()
+        if conn is None:
+            return None
+        with self._read_lock:
+            row = conn.execute(
+                "SELECT request, response FROM claims WHERE claim_id = ?", (claim_id,)
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    async def list(self, policy_id: Optional[str] = None, status: Optional[str] = None,
+                   limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[StoredClaim], Optional[str]]:
+        """Page through claims newest first; pass the returned cursor to get the next page"""
+        return await self._read(self._list, policy_id, status, limit, cursor)
+
+    def _list(self, policy_id: Optional[str], status: Optional[str], limit: int,
+              cursor: Optional[str]) -> Tuple[List[StoredClaim], Optional[str]]:
+        conn = self._connection()
+        if conn is None:
+            return [], None
+        clauses, params = [], []
+        if policy_id is not None:
+            clauses.append("policy_id = ?")
+            params.append(policy_id)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if cursor:
+            created_at, _, claim_id = cursor.partition("|")
+            clauses.append("(created_at, claim_id) < (?, ?)")
+            params.extend([created_at, claim_id])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        with self._read_lock:
+            rows = conn.execute(
+                f"SELECT request, response FROM claims {where} "
+                "ORDER BY created_at DESC, claim_id DESC LIMIT ?",
+                params,
+            ).fetchall()
+        claims = [self._from_row(row) for row in rows]
+        next_cursor = None
+        if len(claims) == limit:
+            last = claims[-1].response
+            next_cursor = f"{last.created_at}|{last.claim_id}"
+        return claims, next_cursor
+
+    async def load_rollups(self) -> Optional[Dict[str, float]]:
+        """Aggregate counters maintained alongside every batch write; None when the store is disabled"""
+        return await self._read(self._load_rollups)
+
+    def _load_rollups(self) -> Optional[Dict[str, float]]:
+        conn = self._connection()
+        if conn is None:
+            return None
+        with self._read_lock:
+            return dict(conn.execute("SELECT metric, value FROM claim_rollups").fetchall())
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """The read connection, opening the database and schema on first use; None when disabled"""
+        if self._conn is not None or self.disabled:
+            return self._conn
+        with self._open_lock:
+            if self._conn is None and not self.disabled:
+                try:
+                    conn = _connect(self.path)
+                    for statement in _SCHEMA:
+                        conn.execute(statement)
+                    conn.commit()
+                    self._conn = conn
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Claim store disabled, cannot open {self.path}: {e}")
+                    self.disabled = True
+        return self._conn
+
+    @staticmethod
+    def _from_row(row: Tuple[str, str]) -> StoredClaim:
+        return StoredClaim(
+            request=ClaimAnalysisRequest.model_validate_json(row[0]),
+            response=ClaimAnalysisResponse.model_validate_json(row[1]),
+        )
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="claim-store-writer", daemon=True
+                )
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _write_loop(self) -> None:
+        conn = _connect(self.path)
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write_batch(conn, batch)
+        conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection,
+                     batch: List[Tuple[StoredClaim, Optional[ClaimAnalysisResponse]]]) -> None:
+        rows = [
+            (
+                c.response.claim_id,
+                c.request.policyId,
+                c.response.status,
+                c.response.fraud_score.risk_level,
+                c.response.fraud_score.score,
+                c.response.created_at,
+                c.request.model_dump_json(),
+                c.response.model_dump_json(),
+            )
+            for c, _ in batch
+        ]
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO claims (claim_id, policy_id, status, risk_level,"
+                    " fraud_score, created_at, request, response) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.executemany(
+                    "INSERT INTO claim_rollups (metric, value) VALUES (?, ?)"
+                    " ON CONFLICT (metric) DO UPDATE SET value = value + excluded.value",
+                    merge_rollups(
+                        (c.response for c, _ in batch), (replaced for _, replaced in batch if replaced is not None)
+                    ).items(),
+                )
+            self.written += len(rows)
+        except sqlite3.Error as e:
+            print(f"Claim store write failed for {len(rows)} claims: {e}")
+            self.dropped += len(rows)
+        with self._pending_lock:
+            for c, _ in batch:
+                if self._pending.get(c.response.claim_id) is c:
+                    del self._pending[c.response.claim_id]
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until everything queued so far has been written (tests and shutdown)"""
+        deadline = time.monotonic() + timeout
+        while self._pending and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def close(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP, timeout=5.0)
+            self._writer.join(timeout=5.0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": not self.disabled,
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
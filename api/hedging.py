@@ -0,0 +1,76 @@
+# api/hedging.py - When to send a hedged (duplicate) LLM request
+import os
+from collections import deque
+from typing import Deque, Dict, Optional
+
+# Fraction of calls allowed to hedge; 0 disables hedging
+LLM_HEDGE_MAX_RATE = float(os.getenv("LLM_HEDGE_MAX_RATE", "0"))
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "50"))
+
+
+class HedgePolicy:
+    """Hedge a call once it outlives the given percentile of recent latencies.
+
+    The hedge rate is capped with a credit scheme: every call earns max_rate
+    credit (up to a small burst) and every hedge spends one, so over time at
+    most max_rate of calls send a second request.
+    """
+
+    def __init__(self, max_rate: float = LLM_HEDGE_MAX_RATE,
+                 percentile: float = LLM_HEDGE_PERCENTILE,
+                 min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+                 samples: int = 1000, burst: float = 5.0):
+        self.max_rate = max(0.0, min(1.0, max_rate))
+        self.percentile = percentile
+        self.min_samples = max(1, min_samples)
+        self.burst = burst
+        self._latencies: Deque[float] = deque(maxlen=samples)
+        self._credit = 0.0
+        self._delay: Optional[float] = None
+        self._observed_since_update = 0
+        self.sent = 0
+        self.skipped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rate > 0
+
+    def observe(self, latency: float) -> None:
+        self._latencies.append(latency)
+        self._observed_since_update += 1
+        # Re-sorting every few samples keeps the percentile fresh at little cost
+        if self._observed_since_update >= 10 or self._delay is None:
+            self._observed_since_update = 0
+            self._update_delay()
+
+    def _update_delay(self) -> None:
+        if len(self._latencies) < self.min_samples:
+            return
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100.0))
+        self._delay = ordered[index]
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging this call, or None to never hedge it"""
+        if not self.enabled:
+            return None
+        self._credit = min(self.burst, self._credit + self.max_rate)
+        return self._delay
+
+    def try_hedge(self) -> bool:
+        """Spend one hedge credit; False once the rate cap is reached"""
+        if self._credit < 1.0:
+            self.skipped += 1
+            return False
+        self._credit -= 1.0
+        self.sent += 1
+        return True
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "delay_seconds": round(self._delay, 3) if self._delay is not None else None,
+            "sent": self.sent,
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,292 @@
+# api/holiday_calendar.py - Day-indexed holiday/weekend flags and fast ISO-8601 timestamp parsing
+import datetime
+import json
+import os
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Years covered by the precomputed flag tables; days outside still get weekend flags
+CALENDAR_FIRST_YEAR = int(os.getenv("CALENDAR_FIRST_YEAR", "2000"))
+CALENDAR_LAST_YEAR = int(os.getenv("CALENDAR_LAST_YEAR", "2040"))
+# Region (e.g. "CA-ON") assumed when a location names no known province or state
+CALENDAR_DEFAULT_REGION = os.getenv("CALENDAR_DEFAULT_REGION", "")
+
+# Bits of a day's flags
+WEEKEND = 1
+HOLIDAY = 2
+
+# Trailing location segments naming a country, skipped when looking for a province/state
+COUNTRY_NAMES = frozenset(("CANADA", "USA", "US", "U.S", "U.S.A", "UNITED STATES", "UNITED STATES OF AMERICA"))
+
+WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+OBSERVED_RULES = ("next_weekday", "nearest_weekday")
+
+
+class CalendarError(ValueError):
+    """Raised when a holiday file is malformed"""
+
+
+class HolidayRule(NamedTuple):
+    name: str
+    regions: Tuple[str, ...]  # e.g. ("CA-ON",), after expanding country codes
+    date: Dict[str, Any]
+    observed: Optional[str]  # how a weekend date is moved to a day off
+    since: Optional[int]
+    until: Optional[int]
+
+
+_fromisoformat = datetime.datetime.fromisoformat
+
+
+def parse_timestamp(text: str) -> Optional[Tuple[int, int]]:
+    """(date ordinal, minute of day) of an ISO-8601 timestamp, or None if unparseable.
+
+    The minute is -1 for a bare date, even one followed by a UTC offset
+    ("2025-12-25Z"). The wall-clock time is used as written;
+    a UTC offset is accepted but not applied. CPython's fromisoformat is
+    implemented in C and beats slicing the string in Python, so it does the
+    parsing; "Z" is only rewritten when present (Python < 3.11 rejects it).
+    """
+    try:
+        moment = _fromisoformat(text if "Z" not in text else text.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    # The date part is YYYY-MM-DD, or YYYYMMDD in basic format
+    if len(text) > 10 and text[4] == "-":
+        timed = text[10] not in "Z+-"
+    else:
+        timed = len(text) > 8 and text[4] != "-" and text[8] not in "Z+-"
+    return moment.toordinal(), moment.hour * 60 + moment.minute if timed else -1
+
+
+def weekday_of(ordinal: int) -> int:
+    """Monday=0, as date.weekday()"""
+    return (ordinal - 1) % 7
+
+
+def _easter(year: int) -> datetime.date:
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    shift = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * shift) // 451
+    month, day = divmod(h + shift - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def holiday_date(spec: Dict[str, Any], year: int) -> datetime.date:
+    """Resolve a holiday date spec for one year.
+
+    Specs are {"month", "day"}, {"month", "weekday", "nth"} (nth=-1 for the
+    last), {"month", "weekday", "on_or_before"} or {"easter": offset}, each
+    with an optional day "offset".
+    """
+    if "easter" in spec:
+        day = _easter(year) + datetime.timedelta(days=int(spec["easter"]))
+    elif "day" in spec:
+        day = datetime.date(year, spec["month"], spec["day"])
+    else:
+        weekday = WEEKDAYS[spec["weekday"]]
+        month = spec["month"]
+        if "on_or_before" in spec:
+            day = datetime.date(year, month, spec["on_or_before"])
+            day -= datetime.timedelta(days=(day.weekday() - weekday) % 7)
+        elif spec["nth"] > 0:
+            day = datetime.date(year, month, 1)
+            day += datetime.timedelta(days=(weekday - day.weekday()) % 7 + 7 * (spec["nth"] - 1))
+        else:
+            following = datetime.date(year + month // 12, month % 12 + 1, 1)
+            day = following - datetime.timedelta(days=1)
+            day -= datetime.timedelta(days=(day.weekday() - weekday) % 7 + 7 * (-spec["nth"] - 1))
+            if day.month != month:
+                raise ValueError(f"no weekday {spec['nth']} in month {month}")
+    return day + datetime.timedelta(days=int(spec.get("offset", 0)))
+
+
+def _clock_minutes(value: str) -> int:
+    try:
+        clock = datetime.datetime.strptime(value, "%H:%M")
+    except (TypeError, ValueError):
+        raise CalendarError(f"Bad time of day: {value!r} (expected HH:MM)") from None
+    return clock.hour * 60 + clock.minute
+
+
+class HolidayCalendar:
+    """Per-region flags (WEEKEND, HOLIDAY) for every day in a year range.
+
+    Each region's flags are one bytes object indexed by days since the first
+    covered day. It is built on the first lookup for that region, so a lookup
+    is one index operation. Holidays falling on a weekend also flag the day
+    they are observed on.
+    """
+
+    def __init__(self, rules: List[HolidayRule], countries: Dict[str, List[str]],
+                 after_hours: Tuple[int, int], version: str = "unversioned",
+                 first_year: int = CALENDAR_FIRST_YEAR, last_year: int = CALENDAR_LAST_YEAR,
+                 default_region: str = CALENDAR_DEFAULT_REGION):
+        self.rules = rules
+        self.version = version
+        self.first_year = first_year
+        self.last_year = last_year
+        self.first_ordinal = datetime.date(first_year, 1, 1).toordinal()
+        self.days = datetime.date(last_year, 12, 31).toordinal() - self.first_ordinal + 1
+        self.after_hours_start, self.after_hours_end = after_hours
+        self.countries = tuple(countries)
+        # Province/state code -> region; codes are unique across countries
+        self._codes = {code: f"{country}-{code}" for country, codes in countries.items() for code in codes}
+        self.regions = tuple(self._codes.values())
+        if default_region and default_region not in self.regions:
+            raise CalendarError(f"Unknown default region: {default_region!r}")
+        self.default_region = default_region or None
+        self._tables: Dict[Optional[str], bytes] = {}
+
+    def region_of(self, location: str) -> Optional[str]:
+        """Region of the province/state code ending a location, else the default.
+
+        A code counts only where addresses put one: first in the last
+        comma-separated segment ("Toronto, ON M5V 3L9") or as the final token
+        ("Toronto ON"), so "PARKING LOT ON MAIN ST" names no province. Trailing
+        country segments ("Toronto, ON, Canada") are skipped. "CA" may be the
+        country, so it means California only when no other code is present.
+        """
+        fallback = None
+        segments = location.split(",")
+        for position in range(len(segments) - 1, -1, -1):
+            tokens = segments[position].split()
+            if not tokens:
+                continue
+            for token in (tokens[0], tokens[-1]) if position else (tokens[-1],):
+                token = token.strip(".;:()")
+                region = self._codes.get(token)
+                if region is not None:
+                    if token not in self.countries:
+                        return region
+                    if fallback is None:
+                        fallback = region
+            country = " ".join(tokens).strip(".").upper()
+            if country not in COUNTRY_NAMES and country not in self.countries:
+                break
+        return fallback or self.default_region
+
+    def table(self, region: Optional[str]) -> bytes:
+        """Flags for every covered day; region None gives weekend flags only"""
+        flags = self._tables.get(region)
+        if flags is None:
+            flags = self._tables[region] = self._build(region)
+        return flags
+
+    def _build(self, region: Optional[str]) -> bytes:
+        flags = bytearray(self.days)
+        first_saturday = (5 - weekday_of(self.first_ordinal)) % 7
+        for start in (first_saturday, first_saturday + 1):
+            flags[start::7] = bytes([WEEKEND]) * len(range(start, self.days, 7))
+
+        def mark(day: datetime.date) -> None:
+            index = day.toordinal() - self.first_ordinal
+            if 0 <= index < self.days:
+                flags[index] |= HOLIDAY
+
+        def is_day_off(day: datetime.date) -> bool:
+            index = day.toordinal() - self.first_ordinal
+            return 0 <= index < self.days and flags[index] != 0
+
+        rules = [rule for rule in self.rules if region in rule.regions]
+        # One year either side, for observed days that cross New Year
+        for year in range(self.first_year - 1, self.last_year + 2):
+            dates = [
+                (holiday_date(rule.date, year), rule.observed) for rule in rules
+                if (rule.since is None or year >= rule.since) and (rule.until is None or year <= rule.until)
+            ]
+            for day, _ in dates:
+                mark(day)
+            # Shift weekend holidays only once every actual date is known, so a
+            # Sunday Christmas skips a Monday Boxing Day
+            for day, observed in dates:
+                if day.weekday() < 5 or observed is None:
+                    continue
+                if observed == "nearest_weekday":
+                    mark(day + datetime.timedelta(days=-1 if day.weekday() == 5 else 1))
+                else:
+                    day += datetime.timedelta(days=1)
+                    while is_day_off(day):
+                        day += datetime.timedelta(days=1)
+                    mark(day)
+        return bytes(flags)
+
+    def day_flags(self, ordinal: int, region: Optional[str]) -> int:
+        index = ordinal - self.first_ordinal
+        if 0 <= index < self.days:
+            return self.table(region)[index]
+        return WEEKEND if weekday_of(ordinal) >= 5 else 0
+
+    def is_after_hours(self, minute: int) -> bool:
+        """Whether a minute of the day falls in the after-hours window (False when unknown)"""
+        if minute < 0:
+            return False
+        start, end = self.after_hours_start, self.after_hours_end
+        if start > end:
+            return minute >= start or minute < end
+        return start <= minute < end
+
+    def timing(self, date_time: str, location: str) -> Tuple[int, bool, bool]:
+        """(weekday, holiday, after_hours) of an incident; weekday is -1 when unparseable"""
+        parsed = parse_timestamp(date_time)
+        if parsed is None:
+            return -1, False, False
+        ordinal, minute = parsed
+        holiday = self.day_flags(ordinal, self.region_of(location)) & HOLIDAY != 0
+        return weekday_of(ordinal), holiday, self.is_after_hours(minute)
+
+
+def _expand_regions(names: List[str], countries: Dict[str, List[str]]) -> Tuple[str, ...]:
+    regions: List[str] = []
+    for name in names:
+        if name in countries:
+            regions.extend(f"{name}-{code}" for code in countries[name])
+            continue
+        country, _, code = name.partition("-")
+        if code not in countries.get(country, ()):
+            raise CalendarError(f"Unknown region: {name!r}")
+        regions.append(name)
+    return tuple(regions)
+
+
+def parse_calendar(data: Dict[str, Any], **kwargs: Any) -> HolidayCalendar:
+    """Validate a decoded holiday file into a HolidayCalendar"""
+    try:
+        countries = {str(country): [str(code) for code in codes] for country, codes in data["regions"].items()}
+        window = data.get("after_hours", {"start": "22:00", "end": "06:00"})
+        after_hours = (_clock_minutes(window["start"]), _clock_minutes(window["end"]))
+        rules = [
+            HolidayRule(
+                name=str(raw["name"]),
+                regions=_expand_regions(raw["regions"], countries),
+                date=raw["date"],
+                observed=raw.get("observed"),
+                since=int(raw["since"]) if "since" in raw else None,
+                until=int(raw["until"]) if "until" in raw else None,
+            )
+            for raw in data["holidays"]
+        ]
+    except (KeyError, TypeError, AttributeError) as e:
+        raise CalendarError(f"Malformed holiday file: {e}") from e
+
+    all_codes = [code for codes in countries.values() for code in codes]
+    if len(set(all_codes)) != len(all_codes):
+        raise CalendarError("Province/state codes must be unique across countries")
+    for rule in rules:
+        if rule.observed is not None and rule.observed not in OBSERVED_RULES:
+            raise CalendarError(f"{rule.name}: unknown observed rule {rule.observed!r}")
+        try:
+            holiday_date(rule.date, rule.since or 2000)
+        except (KeyError, TypeError, ValueError) as e:
+            raise CalendarError(f"{rule.name}: bad date spec {rule.date!r}: {e}") from e
+
+    return HolidayCalendar(rules, countries, after_hours, version=str(data.get("version", "unversioned")), **kwargs)
+
+
+def load_calendar(path: str, **kwargs: Any) -> HolidayCalendar:
+    with open(path, encoding="utf-8") as f:
+        return parse_calendar(json.load(f), **kwargs)
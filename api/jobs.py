@@ -0,0 +1,150 @@
+# api/jobs.py - Asynchronous claim analysis jobs: pluggable store and worker pool
+import asyncio
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+
+from models import ClaimAnalysisResponse, ClaimJob
+
+JOB_STORE = os.getenv("JOB_STORE", "memory")  # "memory" or "sqlite"
+JOB_STORE_DB = os.getenv("JOB_STORE_DB", "jobs.db")
+JOB_STORE_MAX = int(os.getenv("JOB_STORE_MAX", "100000"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "16"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "10000"))
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class JobStore(ABC):
+    """Interface for job persistence; stores that block do so off the event loop"""
+
+    @abstractmethod
+    async def put(self, job: ClaimJob) -> None:
+        ...
+
+    @abstractmethod
+    async def get(self, claim_id: str) -> Optional[ClaimJob]:
+        ...
+
+
+class InMemoryJobStore(JobStore):
+    """Per-process store; the oldest jobs are evicted past max_jobs"""
+
+    def __init__(self, max_jobs: int = JOB_STORE_MAX):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, ClaimJob]" = OrderedDict()
+
+    async def put(self, job: ClaimJob) -> None:
+        self._jobs[job.claim_id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+    async def get(self, claim_id: str) -> Optional[ClaimJob]:
+        return self._jobs.get(claim_id)
+
+
+class SQLiteJobStore(JobStore):
+    """Store that survives restarts and is visible to every worker sharing the file.
+
+    Queries run on one background thread, in the order they were issued, so a
+    job's status updates are never written out of order.
+    """
+
+    def __init__(self, path: str = JOB_STORE_DB):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS claim_jobs ("
+            " claim_id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " body TEXT NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store")
+
+    async def put(self, job: ClaimJob) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._put, job)
+
+    async def get(self, claim_id: str) -> Optional[ClaimJob]:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._get, claim_id)
+
+    def _put(self, job: ClaimJob) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO claim_jobs (claim_id, status, body) VALUES (?, ?, ?)",
+                (job.claim_id, job.status, job.model_dump_json()),
+            )
+
+    def _get(self, claim_id: str) -> Optional[ClaimJob]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM claim_jobs WHERE claim_id = ?", (claim_id,)
+            ).fetchone()
+        return ClaimJob.model_validate_json(row[0]) if row else None
+
+
+def create_job_store(kind: str = JOB_STORE) -> JobStore:
+    if kind == "memory":
+        return InMemoryJobStore()
+    if kind == "sqlite":
+        return SQLiteJobStore()
+    raise ValueError(f"Unknown job store: {kind}")
+
+
+class JobRunner:
+    """Bounded queue drained by a pool of in-process worker tasks"""
+
+    def __init__(self, store: JobStore, workers: int = JOB_WORKERS, queue_size: int = JOB_QUEUE_SIZE):
+        self.store = store
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+
+    def _ensure_started(self) -> asyncio.Queue:
+        # Workers start on first submit so they bind to the serving event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        return self._queue
+
+    async def submit(self, job: ClaimJob, work: Callable[[], Awaitable[ClaimAnalysisResponse]]) -> None:
+        """Enqueue the job and record it as queued; raises asyncio.QueueFull when saturated"""
+        queue = self._ensure_started()
+        queue.put_nowait((job, work))
+        await self.store.put(job)
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            job, work = await queue.get()
+            try:
+                await self.store.put(job.model_copy(update={"status": JOB_RUNNING}))
+                result = await work()
+                await self.store.put(job.model_copy(update={
+                    "status": JOB_COMPLETED,
+                    "result": result,
+                    "completed_at": datetime.utcnow().isoformat(),
+                }))
+            except Exception as e:
+                print(f"Claim job {job.claim_id} failed: {e}")
+                await self.store.put(job.model_copy(update={
+                    "status": JOB_FAILED,
+                    "error": str(e),
+                    "completed_at": datetime.utcnow().isoformat(),
+                }))
+            finally:
+                queue.task_done()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
@@ -0,0 +1,264 @@
+# api/keyword_scanner.py - Aho-Corasick multi-phrase scanning of claim descriptions
+import json
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, NamedTuple, Set, Tuple
+
+
+class KeywordMatch(NamedTuple):
+    phrase: str
+    category: str
+    weight: float
+    start: int  # offsets into the original (unfolded) text
+    end: int
+
+
+class _Pattern(NamedTuple):
+    phrase: str
+    category: str
+    weight: float
+    length: int  # length in folded characters
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+# Per-character case folding, memoized; any whitespace folds to a single space
+_FOLD: Dict[str, str] = {}
+
+
+def _fold_char(char: str) -> str:
+    folded = " " if char.isspace() else char.casefold()
+    if len(_FOLD) < 65536:
+        _FOLD[char] = folded
+    return folded
+
+
+def _match_start(text: str, last: int, length: int) -> int:
+    """Walk back from text[last] over `length` folded characters to the match start"""
+    index = last
+    remaining = length - len(_FOLD.get(text[index]) or _fold_char(text[index]))
+    while remaining > 0:
+        index -= 1
+        if text[index].isspace():
+            # A whitespace run folds to a single space
+            while index > 0 and text[index - 1].isspace():
+                index -= 1
+            remaining -= 1
+        else:
+            remaining -= len(_FOLD.get(text[index]) or _fold_char(text[index]))
+    return index
+
+
+def _normalize(phrase: str) -> str:
+    return " ".join(phrase.casefold().split())
+
+
+def _needles(phrases: Iterable[str]) -> Tuple[Tuple[str, Tuple[int, ...]], ...]:
+    """Few substrings that locate every possible phrase start.
+
+    Every phrase's first word contains one of the needles at a fixed offset,
+    so a phrase can only start at (needle position - offset). Needles are
+    found with str.find, which runs in C.
+    """
+    needles: Dict[str, Set[int]] = {}
+    for word in sorted({phrase.split(" ", 1)[0] for phrase in phrases}, key=len):
+        for needle, offsets in needles.items():
+            if needle in word:
+                offsets.add(word.index(needle))
+                break
+        else:
+            needles[word] = {0}
+    return tuple((needle, tuple(sorted(offsets))) for needle, offsets in needles.items())
+
+
+class KeywordAutomaton:
+    """Matches every lexicon phrase in a single pass over the text.
+
+    Phrases are case-folded and their internal whitespace collapsed. The trie
+    walk folds the text character by character instead of normalizing a copy.
+    A match only counts when it starts and ends on word boundaries, so 'fire'
+    does not fire on 'firewall'.
+
+    The prefilter does copy the text once: most descriptions contain no
+    phrase at all, and a per-character Python loop costs far more than the
+    old substring checks. So ASCII text is lowercased (for ASCII that is the
+    case fold, and offsets are kept) and searched for a few needles with
+    str.find, which has no case-insensitive form. Only the positions where a
+    phrase could start are walked through the trie. Other text, where case
+    folding can expand a character, gets the full automaton pass with no copy.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, float]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self.patterns: List[_Pattern] = []
+
+        for phrase, category, weight in entries:
+            folded = _normalize(phrase)
+            if not folded:
+                continue
+            state = 0
+            for char in folded:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(len(self.patterns))
+            self.patterns.append(_Pattern(phrase, category, float(weight), len(folded)))
+
+        # Phrases ending exactly at each state, before failure links add their suffixes
+        self._ends = [list(hits) for hits in self._out]
+        self._needles = _needles(_normalize(pattern.phrase) for pattern in self.patterns)
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        queue: Deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Inherit the outputs of the longest proper suffix
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def scan(self, text: str) -> List[KeywordMatch]:
+        """Return every phrase occurrence in text, in order of where it ends"""
+        if not self.patterns:
+            return []
+        if not text.isascii():
+            return self.scan_all(text)
+        lowered = text.lower()
+        starts: Set[int] = set()
+        for needle, offsets in self._needles:
+            position = lowered.find(needle)
+            while position >= 0:
+                starts.update(position - offset for offset in offsets if position >= offset)
+                position = lowered.find(needle, position + 1)
+        matches: List[KeywordMatch] = []
+        for start in sorted(starts):
+            self._match_at(text, start, matches)
+        if len(matches) > 1:
+            matches.sort(key=lambda match: match.end)
+        return matches
+
+    def _match_at(self, text: str, start: int, matches: List[KeywordMatch]) -> None:
+        """Append the phrases starting at text[start], walking the trie without failure links"""
+        if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+            return
+        goto, ends, patterns = self._goto, self._ends, self.patterns
+        fold = _FOLD
+        state = 0
+        last_was_space = False
+        n = len(text)
+        for index in range(start, n):
+            raw = text[index]
+            folded = fold.get(raw)
+            if folded is None:
+                folded = _fold_char(raw)
+            if folded == " ":
+                if last_was_space:
+                    continue
+                last_was_space = True
+            else:
+                last_was_space = False
+
+            for char in folded:
+                state = goto[state].get(char)
+                if state is None:
+                    return
+                hits = ends[state]
+                if not hits:
+                    continue
+                if index + 1 < n and _is_word_char(text[index + 1]) and _is_word_char(raw):
+                    continue
+                for pattern_id in hits:
+                    pattern = patterns[pattern_id]
+                    matches.append(KeywordMatch(
+                        pattern.phrase, pattern.category, pattern.weight, start, index + 1
+                    ))
+
+    def scan_all(self, text: str) -> List[KeywordMatch]:
+        """scan() as one automaton pass over every character, without the regex prefilter"""
+        if not self.patterns:
+            return []
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        fold = _FOLD
+        matches: List[KeywordMatch] = []
+        state = 0
+        last_was_space = True
+        n = len(text)
+
+        for index, raw in enumerate(text):
+            folded = fold.get(raw)
+            if folded is None:
+                folded = _fold_char(raw)
+            if folded == " ":
+                if last_was_space:
+                    continue
+                last_was_space = True
+            else:
+                last_was_space = False
+
+            for char in folded:
+                nxt = goto[state].get(char)
+                while nxt is None and state:
+                    state = fail[state]
+                    nxt = goto[state].get(char)
+                if nxt is None:
+                    state = 0
+                    continue
+                state = nxt
+                hits = out[state]
+                if not hits:
+                    continue
+                if index + 1 < n and _is_word_char(text[index + 1]) and _is_word_char(raw):
+                    continue
+                for pattern_id in hits:
+                    pattern = patterns[pattern_id]
+                    start = _match_start(text, index, pattern.length)
+                    if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                        continue
+                    matches.append(KeywordMatch(
+                        pattern.phrase, pattern.category, pattern.weight, start, index + 1
+                    ))
+        return matches
+
+    def categories(self, text: str) -> Dict[str, float]:
+        """Highest matched weight per category"""
+        found: Dict[str, float] = {}
+        for match in self.scan(text):
+            if match.weight > found.get(match.category, 0.0):
+                found[match.category] = match.weight
+        return found
+
+
+def parse_lexicon(data: Dict[str, Any]) -> List[Tuple[str, str, float]]:
+    """Flatten {"categories": {name: {"weight": w, "phrases": [...]}}} into entries.
+
+    A phrase may be a plain string or {"phrase": ..., "weight": ...} to
+    override its category's weight.
+    """
+    entries = []
+    for category, spec in data["categories"].items():
+        default_weight = float(spec.get("weight", 1.0))
+        for item in spec["phrases"]:
+            if isinstance(item, str):
+                entries.append((item, category, default_weight))
+            else:
+                entries.append((item["phrase"], category, float(item.get("weight", default_weight))))
+    return entries
+
+
+def load_automaton(path: str) -> KeywordAutomaton:
+    with open(path, encoding="utf-8") as f:
+        return KeywordAutomaton(parse_lexicon(json.load(f)))
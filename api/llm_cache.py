@@ -0,0 +1,159 @@
+# api/llm_cache.py - Content-addressed cache for LLM claim analyses
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from models import IncidentData, FraudScore
+
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "10000"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", "")  # empty disables the on-disk tier
+# Expired rows are deleted by a write at most this often
+LLM_CACHE_PURGE_INTERVAL = float(os.getenv("LLM_CACHE_PURGE_INTERVAL", "3600"))
+
+
+def claim_cache_key(incident: IncidentData, fraud_score: FraudScore, prompt_version: str) -> str:
+    """Hash everything that shapes the LLM prompt into a stable key"""
+    payload = {
+        "incident": incident.model_dump(),
+        "fraud_score": {
+            "score": fraud_score.score,
+            "risk_level": fraud_score.risk_level,
+            "indicators": fraud_score.indicators,
+        },
+        "prompt_version": prompt_version,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SQLiteCacheTier:
+    """On-disk tier shared by every worker pointing at the same file.
+
+    Calls block on SQLite, so LLMResponseCache runs them off the event loop.
+    """
+
+    def __init__(self, path: str, purge_interval: float = LLM_CACHE_PURGE_INTERVAL):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self.purge_interval = purge_interval
+        self._next_purge = time.monotonic()
+        self.purged = 0
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+        if self.purge_interval > 0 and time.monotonic() >= self._next_purge:
+            self._next_purge = time.monotonic() + self.purge_interval
+            self.purged += self.purge_expired()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+
+
+class LLMResponseCache:
+    """Two-tier cache: in-process LRU with TTL, backed by an optional SQLite file.
+
+    Disk reads and writes run on a single background thread: get() awaits
+    the read, set() does not wait for the write.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_SIZE, ttl_seconds: float = LLM_CACHE_TTL,
+                 db_path: str = LLM_CACHE_DB):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = SQLiteCacheTier(db_path) if db_path else None
+        self._disk_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-cache") \
+            if self._disk is not None else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                del self._entries[key]
+
+        if self._disk is not None:
+            found = await asyncio.get_running_loop().run_in_executor(
+                self._disk_executor, self._disk.get, key
+            )
+            if found is not None:
+                self._remember(key, *found)
+                self.disk_hits += 1
+                return found[0]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, value, expires_at)
+        if self._disk is not None:
+            self._disk_executor.submit(self._disk_set, key, value, expires_at)
+
+    def _disk_set(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        try:
+            self._disk.set(key, value, expires_at)
+        except sqlite3.Error as e:
+            print(f"LLM cache write failed: {e}")
+
+    def _remember(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "disk_enabled": self._disk is not None,
+            "disk_purged": self._disk.purged if self._disk is not None else 0,
+        }
@@ -0,0 +1,219 @@
+# api/llm_client.py - Non-blocking Gemini client with bounded concurrency
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from hedging import HedgePolicy
+from llm_parser import json_generation_config
+from llm_scheduler import LLMScheduler, Priority, LLM_EXPECTED_OUTPUT_TOKENS
+from prompts import estimate_tokens
+from metrics import LLM_HEDGES
+
+# "async" uses the SDK's native coroutine; "thread" runs the blocking call in a pool
+GEMINI_CALL_MODE = os.getenv("GEMINI_CALL_MODE", "async")
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "256"))
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-pro")
+# "1" asks for application/json replies; needs a model and SDK with JSON mode
+GEMINI_JSON_MODE = os.getenv("GEMINI_JSON_MODE", "0") == "1"
+
+
+def gemini_model_factory(api_key: str, model_name: str = GEMINI_MODEL,
+                         json_mode: bool = GEMINI_JSON_MODE) -> Callable[[], Any]:
+    """Build the Gemini model on demand; importing the SDK dominates cold-start time"""
+    def build() -> Any:
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        generation_config = json_generation_config(genai) if json_mode else None
+        if json_mode and generation_config is None:
+            print("GEMINI_JSON_MODE ignored: the installed google-generativeai has no JSON mode")
+        return genai.GenerativeModel(model_name, generation_config=generation_config)
+    return build
+
+
+class LLMClient:
+    """Wraps a Gemini model so calls never block the event loop.
+
+    With a breaker, calls fail fast with CircuitOpenError while Gemini is
+    unhealthy, and each call is cut off at the breaker's adaptive deadline.
+    With a scheduler, calls first wait for RPM/TPM quota in priority order.
+    With a hedge policy, a call that outlives the hedge delay gets a duplicate
+    request; whichever answers first wins and the other is cancelled.
+
+    Pass model_factory instead of model to defer building the model until the
+    first call (or an explicit warm_up()).
+    """
+
+    def __init__(self, model: Any = None, mode: str = GEMINI_CALL_MODE,
+                 max_concurrency: int = GEMINI_MAX_CONCURRENCY,
+                 breaker: Optional[CircuitBreaker] = None,
+                 scheduler: Optional[LLMScheduler] = None,
+                 hedge: Optional[HedgePolicy] = None,
+                 model_factory: Optional[Callable[[], Any]] = None):
+        if mode not in ("async", "thread"):
+            raise ValueError(f"Unknown Gemini call mode: {mode}")
+        if model is None and model_factory is None:
+            raise ValueError("LLMClient needs a model or a model_factory")
+        self.model = model
+        self._model_factory = model_factory
+        self._model_lock = threading.Lock()
+        self._model_loading: Optional["asyncio.Future[Any]"] = None
+        self.mode = mode
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.breaker = breaker
+        self.scheduler = scheduler
+        self.hedge = hedge
+        self.in_flight = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running loop (required on Python 3.9)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def warm_up(self) -> Any:
+        """Build the model now (blocking); safe to run in a background thread"""
+        with self._model_lock:
+            if self.model is None:
+                self.model = self._model_factory()
+            return self.model
+
+    async def _load_model(self) -> Any:
+        # Built off the event loop; concurrent first calls share one build
+        if self._model_loading is None:
+            loop = asyncio.get_running_loop()
+            self._model_loading = loop.run_in_executor(None, self.warm_up)
+        try:
+            return await asyncio.shield(self._model_loading)
+        except Exception:
+            self._model_loading = None  # let the next call retry
+            raise
+
+    @property
+    def model_loaded(self) -> bool:
+        return self.model is not None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="gemini"
+            )
+        return self._executor
+
+    async def _call(self, prompt: str, **kwargs: Any) -> str:
+        if self.mode == "async":
+            response = await self.model.generate_content_async(prompt, **kwargs)
+        else:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                self._get_executor(),
+                partial(self.model.generate_content, prompt, **kwargs),
+            )
+        return response.text
+
+    async def _attempt(self, prompt: str, tokens: int, **kwargs: Any) -> str:
+        hedge = self.hedge
+        delay = hedge.hedge_delay() if hedge is not None else None
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(self._call(prompt, **kwargs))
+        if delay is None:
+            text = await primary
+            if hedge is not None:
+                hedge.observe(time.perf_counter() - started)
+            return text
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                text = primary.result()
+                hedge.observe(time.perf_counter() - started)
+                return text
+            # The hedge spends quota too, so only send it if quota is free right now
+            if not hedge.try_hedge() or (self.scheduler is not None
+                                         and not self.scheduler.try_acquire(tokens)):
+                LLM_HEDGES.labels("skipped").inc()
+                text = await primary
+                hedge.observe(time.perf_counter() - started)
+                return text
+
+            hedged_at = time.perf_counter()
+            secondary = asyncio.ensure_future(self._call(prompt, **kwargs))
+            try:
+                pending = {primary, secondary}
+                while True:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    winner = next(iter(done))
+                    # A failed attempt only loses if the other one can still answer
+                    if winner.exception() is None or not pending:
+                        break
+                text = winner.result()
+                if winner is primary:
+                    LLM_HEDGES.labels("primary_won").inc()
+                    hedge.observe(time.perf_counter() - started)
+                else:
+                    LLM_HEDGES.labels("hedge_won").inc()
+                    hedge.observe(time.perf_counter() - hedged_at)
+                return text
+            finally:
+                secondary.cancel()
+        finally:
+            primary.cancel()
+
+    async def generate(self, prompt: str, priority: Priority = (), background: bool = False,
+                       **kwargs: Any) -> str:
+        """Send a prompt to Gemini and return the response text.
+
+        Background calls wait for quota as long as it takes instead of being shed.
+        """
+        if self.model is None:
+            await self._load_model()
+        breaker = self.breaker
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError("Gemini circuit breaker is open")
+        tokens = estimate_tokens(prompt) + LLM_EXPECTED_OUTPUT_TOKENS
+        if self.scheduler is not None:
+            try:
+                await self.scheduler.acquire(priority, tokens, background)
+            except BaseException:
+                # Shed before reaching Gemini; not a failure of the upstream
+                if breaker is not None:
+                    breaker.record_cancelled()
+                raise
+
+        if breaker is None:
+            async with self._get_semaphore():
+                self.in_flight += 1
+                try:
+                    return await self._attempt(prompt, tokens, **kwargs)
+                finally:
+                    self.in_flight -= 1
+
+        try:
+            async with self._get_semaphore():
+                self.in_flight += 1
+                started = time.perf_counter()
+                try:
+                    # A timed-out thread-mode call keeps its worker until Gemini answers
+                    text = await asyncio.wait_for(self._attempt(prompt, tokens, **kwargs), breaker.deadline())
+                finally:
+                    self.in_flight -= 1
+                elapsed = time.perf_counter() - started
+        except asyncio.CancelledError:
+            breaker.record_cancelled()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success(elapsed)
+        return text
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
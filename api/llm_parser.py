@@ -0,0 +1,174 @@
+# api/llm_parser.py - Extract and validate the JSON analysis from a Gemini reply
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from models import IncidentData, FraudScore, AIAnalysis
+from metrics import LLM_PARSE
+
+_DECODER = json.JSONDecoder()
+# Only characters that change nesting or string state matter to the scanner
+_STRUCTURAL = re.compile(r'[{}"\\]')
+_NUMBER_NOISE = re.compile(r"[$,\s]")
+_LEADING_SPACE = re.compile(r"\s*")
+
+
+class LLMParseError(ValueError):
+    """Raised when a reply has no usable JSON analysis"""
+
+
+def json_generation_config(genai: Any) -> Optional[Dict[str, str]]:
+    """generation_config asking for a JSON reply, or None if the SDK cannot express it"""
+    fields = getattr(genai.types.GenerationConfig, "__dataclass_fields__", {})
+    if "response_mime_type" not in fields:
+        return None
+    return {"response_mime_type": "application/json"}
+
+
+def find_json_object(text: str, start: int = 0) -> Optional[Tuple[int, int]]:
+    """Span of the first balanced {...} at or after start, in one pass.
+
+    The regex jumps straight between braces, quotes and backslashes, so
+    ordinary characters are skipped in C. Braces inside strings are ignored.
+    """
+    begin = text.find("{", start)
+    if begin < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped_at = -1
+    for match in _STRUCTURAL.finditer(text, begin):
+        pos = match.start()
+        if pos == escaped_at:
+            continue
+        char = text[pos]
+        if in_string:
+            if char == "\\":
+                escaped_at = pos + 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return begin, pos + 1
+    return None
+
+
+def extract_json(text: str) -> Dict[str, Any]:
+    """Decode the first JSON object in text without slicing it out first.
+
+    JSON-mode replies start with the object and decode directly. Otherwise
+    each "{" is tried in turn (skipping prose and ``` fences); a candidate that
+    does not decode is skipped whole via find_json_object, so the braces
+    nested inside it are not retried one by one.
+    """
+    # Where the reply starts, found without copying it the way lstrip() would
+    begin = _LEADING_SPACE.match(text).end()
+    pos = text.find("{", begin)
+    found = False
+    while pos >= 0:
+        found = True
+        try:
+            value, _ = _DECODER.raw_decode(text, pos)
+            if isinstance(value, dict):
+                LLM_PARSE.labels("direct" if pos == begin else "scanned").inc()
+                return value
+        except ValueError:
+            pass
+        span = find_json_object(text, pos)
+        pos = text.find("{", span[1] if span is not None else pos + 1)
+
+    LLM_PARSE.labels("invalid_json" if found else "no_json").inc()
+    raise LLMParseError("No valid JSON object in LLM reply" if found else "No JSON object in LLM reply")
+
+
+def _payout(value: Any) -> Any:
+    # Tolerate "$1,200.50"-style amounts
+    if isinstance(value, str):
+        return _NUMBER_NOISE.sub("", value)
+    return value
+
+
+def parse_analysis(text: str, incident: IncidentData, fraud_score: FraudScore) -> AIAnalysis:
+    """Validate a Gemini reply into AIAnalysis, defaulting any missing field"""
+    raw = extract_json(text)
+    try:
+        return analysis_from_json(raw, incident, fraud_score)
+    except LLMParseError:
+        LLM_PARSE.labels("invalid_fields").inc()
+        raise
+
+
+def parse_batch_analyses(text: str, claims: List[Tuple[IncidentData, FraudScore]]) -> Dict[int, AIAnalysis]:
+    """Analyses from a batch reply, keyed by claim number.
+
+    Accepts a bare JSON array or an object wrapping one. Entries with a
+    missing, unknown or repeated index, or invalid fields, are left out so the
+    caller can retry those claims one by one.
+    """
+    entries = _extract_array(text)
+    analyses: Dict[int, AIAnalysis] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get("index")
+        try:
+            index = int(index)
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= index < len(claims) or index in analyses:
+            continue
+        try:
+            analyses[index] = analysis_from_json(entry, *claims[index])
+        except LLMParseError:
+            continue
+    return analyses
+
+
+def _extract_array(text: str) -> List[Any]:
+    pos = text.find("[")
+    while pos >= 0:
+        try:
+            value, _ = _DECODER.raw_decode(text, pos)
+            if isinstance(value, list):
+                return value
+        except ValueError:
+            pass
+        pos = text.find("[", pos + 1)
+    # Some replies wrap the array, e.g. {"analyses": [...]}
+    wrapper = extract_json(text)
+    for value in wrapper.values():
+        if isinstance(value, list):
+            return value
+    raise LLMParseError("No JSON array in LLM batch reply")
+
+
+def analysis_from_json(raw: Dict[str, Any], incident: IncidentData, fraud_score: FraudScore) -> AIAnalysis:
+    """Validate one decoded analysis object, defaulting any missing field"""
+    red_flags = raw.get("red_flags")
+    if isinstance(red_flags, str):
+        red_flags = [red_flags]
+    fields = {
+        "validity": raw.get("validity"),
+        "recommendation": raw.get("recommendation"),
+        "estimated_payout": _payout(raw.get("estimated_payout")),
+        "red_flags": red_flags,
+        "reasoning": raw.get("reasoning"),
+    }
+    defaults = {
+        "validity": "needs_review",
+        "recommendation": "manual_review",
+        "estimated_payout": (incident.claimedAmount or 0.0) * 0.8,
+        "red_flags": fraud_score.indicators,
+        "reasoning": "AI analysis completed",
+    }
+    try:
+        return AIAnalysis.model_validate({
+            name: defaults[name] if value is None else value for name, value in fields.items()
+        })
+    except ValueError as e:
+        raise LLMParseError(f"LLM reply failed validation: {e}") from e
@@ -0,0 +1,195 @@
+# api/llm_scheduler.py - Quota-aware LLM dispatch: token buckets plus a priority queue
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from models import IncidentData, FraudScore
+from metrics import LLM_QUEUE_WAIT, LLM_SHED
+
+# Gemini quota; 0 disables that limit (the default, so calls are not throttled
+# unless the deployment's quota is configured)
+LLM_RATE_RPM = float(os.getenv("LLM_RATE_RPM", "0"))
+LLM_RATE_TPM = float(os.getenv("LLM_RATE_TPM", "0"))
+LLM_QUEUE_MAX = int(os.getenv("LLM_QUEUE_MAX", "1000"))
+LLM_QUEUE_MAX_WAIT = float(os.getenv("LLM_QUEUE_MAX_WAIT", "10"))
+# Output tokens charged against the TPM budget up front for every call
+LLM_EXPECTED_OUTPUT_TOKENS = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", "256"))
+
+Priority = Tuple[float, ...]
+
+
+class LLMSaturated(Exception):
+    """Raised when a call is shed because the LLM quota is saturated"""
+
+
+def claim_priority(incident: IncidentData, fraud_score: FraudScore, background: bool = False) -> Priority:
+    """Higher sorts first: interactive before background, then fraud score, then amount"""
+    return (0.0 if background else 1.0, fraud_score.score, incident.claimedAmount or 0.0)
+
+
+class TokenBucket:
+    """Refills continuously at rate_per_minute, holding at most one minute's worth"""
+
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = rate_per_minute
+        self.tokens = rate_per_minute
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until amount tokens are available (0 if they are now)"""
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        if self.enabled:
+            self.tokens -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    """Admits LLM calls within the RPM/TPM quota, highest priority first.
+
+    A call that fits the budget with nobody queued goes straight through.
+    Otherwise it waits in a priority queue drained by a single dispatcher task.
+    When the queue is full the lowest-priority call is shed, and calls still
+    queued after max_wait seconds are shed too; shed calls raise LLMSaturated.
+
+    Background calls (LLM reviews of claims already answered by rules) are
+    never shed: they wait, behind every interactive call, until quota frees
+    up. They do not count toward max_queue; the review queue bounds them.
+    """
+
+    def __init__(self, rpm: float = LLM_RATE_RPM, tpm: float = LLM_RATE_TPM,
+                 max_queue: int = LLM_QUEUE_MAX, max_wait: float = LLM_QUEUE_MAX_WAIT):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_queue = max(1, max_queue)
+        self.max_wait = max_wait
+        # Entries are [sort_key, seq, tokens, future, background]; abandoned futures are skipped lazily
+        self._heap: List[List[Any]] = []
+        self._seq = itertools.count()
+        self._queued = 0
+        self._queued_background = 0
+        self._dispatcher: Optional["asyncio.Task[None]"] = None
+        self.admitted = 0
+        self.shed = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    def _available(self, tokens: int) -> bool:
+        return self.requests.delay(1) == 0 and self.tokens.delay(tokens) == 0
+
+    def _take(self, tokens: int) -> None:
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self.admitted += 1
+
+    def try_acquire(self, tokens: int) -> bool:
+        """Take quota only if it is free right now and nobody is queued"""
+        if self._queued or not self._available(tokens):
+            return False
+        self._take(tokens)
+        return True
+
+    async def acquire(self, priority: Priority, tokens: int, background: bool = False) -> None:
+        """Wait for quota; raises LLMSaturated if an interactive call is shed"""
+        if not self._queued and self._available(tokens):
+            self._take(tokens)
+            LLM_QUEUE_WAIT.observe(0.0)
+            return
+
+        key = tuple(-p for p in priority)
+        if not background and self._queued - self._queued_background >= self.max_queue \
+                and not self._evict_below(key):
+            self._shed("queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, [key, next(self._seq), tokens, future, background])
+        self._queued += 1
+        self._queued_background += background
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), None if background else self.max_wait)
+        except asyncio.TimeoutError:
+            if not future.done():
+                future.cancel()
+                self._dequeued(background)
+                self._shed("timeout")
+            await future  # admitted or evicted just as the wait ran out
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+                self._dequeued(background)
+            raise
+        finally:
+            LLM_QUEUE_WAIT.observe(time.monotonic() - started)
+
+    def _dequeued(self, background: bool) -> None:
+        self._queued -= 1
+        self._queued_background -= background
+
+    def _evict_below(self, key: Tuple[float, ...]) -> bool:
+        """Shed the lowest-priority queued interactive call if it ranks below key"""
+        live = [entry for entry in self._heap if not entry[3].done() and not entry[4]]
+        if not live:
+            return False
+        worst = max(live, key=lambda entry: (entry[0], entry[1]))
+        if worst[0] <= key:
+            return False
+        worst[3].set_exception(LLMSaturated("Evicted by higher-priority LLM work"))
+        self._queued -= 1
+        self.shed += 1
+        LLM_SHED.labels("evicted").inc()
+        return True
+
+    def _shed(self, reason: str) -> None:
+        self.shed += 1
+        LLM_SHED.labels(reason).inc()
+        raise LLMSaturated(f"LLM quota saturated ({reason})")
+
+    async def _dispatch(self) -> None:
+        heap = self._heap
+        while heap:
+            key, _, tokens, future, background = heap[0]
+            if future.done():
+                heapq.heappop(heap)
+                continue
+            delay = max(self.requests.delay(1), self.tokens.delay(tokens))
+            if delay > 0:
+                # Re-check the head afterwards: a higher-priority call may have arrived
+                await asyncio.sleep(delay)
+                continue
+            heapq.heappop(heap)
+            self._take(tokens)
+            self._dequeued(background)
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queued,
+            "queued_background": self._queued_background,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "rpm": self.requests.capacity,
+            "tpm": self.tokens.capacity,
+        }
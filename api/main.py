@@ -1,17 +1,113 @@
 # api/main.py - FastAPI backend with Gemini AI integration
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from fastapi.responses import Response
+from pydantic import ValidationError
+from typing import Optional, Dict, Any, List, Awaitable
 from datetime import datetime
+import asyncio
 import os
-import google.generativeai as genai
+import time
+from llm_client import LLMClient, gemini_model_factory
+from circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, HALF_OPEN
+from llm_scheduler import LLMScheduler, LLMSaturated, claim_priority
+from prompts import PROMPT_CACHE_VERSION, build_analysis_prompt, build_batch_prompt, estimate_tokens
+from llm_parser import parse_analysis, parse_batch_analyses, LLMParseError
+from micro_batcher import MicroBatcher
+from hedging import HedgePolicy
+from llm_cache import LLMResponseCache, claim_cache_key
+from singleflight import SingleFlight
+from jobs import JobRunner, create_job_store, JOB_QUEUED, JOB_COMPLETED
+from claim_store import ClaimStore
+from claim_ids import new_claim_id
+from dashboard_stats import DashboardStats
+from ndjson import NDJSONStreamResponse, iter_ndjson_lines
+from responses import FastJSONResponse
+from routing import (
+    RoutingPolicy,
+    ReviewQueue,
+    PATH_CACHE,
+    PATH_RULES,
+    PATH_DEFERRED,
+    PATH_FALLBACK,
+)
+from models import (
+    IncidentData,
+    ClaimAnalysisRequest,
+    FraudScore,
+    AIAnalysis,
+    ClaimAnalysisResponse,
+    BatchItemResult,
+    BatchAnalysisResponse,
+    ClaimJob,
+    ClaimPage,
+)
+from scoring import calculate_fraud_score, fraud_rules, fraud_calendar
+from metrics import (
+    registry,
+    CONTENT_TYPE,
+    STAGE_LATENCY,
+    LLM_CALLS,
+    LLM_FALLBACKS,
+    LLM_WASTED_TOKENS,
+    LLM_MICROBATCHES,
+    LLM_MICROBATCH_SIZE,
+    CLAIMS_BY_RISK,
+    ANALYSIS_PATHS,
+)
 
 # Configure Gemini AI
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+llm_breaker = CircuitBreaker()
+llm_scheduler = LLMScheduler()
+llm_hedge = HedgePolicy()
 if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-pro')
+    # The Gemini SDK is imported on the first LLM call, so cold starts that only
+    # serve /health or the dashboard never pay for it
+    llm = LLMClient(model_factory=gemini_model_factory(GEMINI_API_KEY),
+                    breaker=llm_breaker, scheduler=llm_scheduler, hedge=llm_hedge)
+
+# Build the Gemini model in the background at startup instead of on the first claim
+GEMINI_WARMUP = os.getenv("GEMINI_WARMUP", "0") == "1"
+
+llm_cache = LLMResponseCache()
+llm_inflight = SingleFlight()
+routing_policy = RoutingPolicy()
+review_queue = ReviewQueue()
+job_runner = JobRunner(create_job_store())
+claim_store = ClaimStore()
+dashboard_stats = DashboardStats(shared=claim_store.load_rollups)
+
+# Per-stage latency histograms
+STAGE_RULE_SCORING = STAGE_LATENCY.labels("rule_scoring")
+STAGE_PROMPT_BUILD = STAGE_LATENCY.labels("prompt_build")
+STAGE_LLM_CALL = STAGE_LATENCY.labels("llm_call")
+STAGE_JSON_EXTRACTION = STAGE_LATENCY.labels("json_extraction")
+STAGE_RESPONSE_BUILD = STAGE_LATENCY.labels("response_build")
+STAGE_ANALYZE_TOTAL = STAGE_LATENCY.labels("analyze_total")
+
+registry.gauge("cortex_llm_in_flight", "Gemini calls currently in flight",
+               lambda: llm.in_flight if GEMINI_API_KEY else 0)
+registry.gauge("cortex_llm_circuit_state", "Gemini circuit breaker state (0 closed, 1 half-open, 2 open)",
+               lambda: 0 if llm_breaker.state == CLOSED else 1 if llm_breaker.state == HALF_OPEN else 2)
+registry.gauge("cortex_llm_deadline_seconds", "Current adaptive per-call Gemini timeout",
+               llm_breaker.deadline)
+registry.gauge("cortex_llm_queue_depth", "LLM calls waiting for Gemini quota",
+               lambda: llm_scheduler.queue_depth)
+registry.gauge("cortex_llm_coalesced_in_flight", "Distinct claim keys with an LLM call in flight",
+               lambda: llm_inflight.in_flight)
+registry.gauge("cortex_review_queue_pending", "Deferred LLM reviews not yet finished",
+               lambda: review_queue.stats()["pending"])
+registry.gauge("cortex_job_queue_depth", "Analysis jobs waiting for a worker",
+               lambda: job_runner.queue_depth)
+registry.gauge("cortex_claim_store_queue_depth", "Claims waiting to be written to the store",
+               lambda: claim_store.stats()["queued"])
+
+# Batch analysis limits
+BATCH_MAX_CLAIMS = int(os.getenv("BATCH_MAX_CLAIMS", "1000"))
+BATCH_MAX_IN_FLIGHT = int(os.getenv("BATCH_MAX_IN_FLIGHT", "32"))
+STREAM_MAX_IN_FLIGHT = int(os.getenv("STREAM_MAX_IN_FLIGHT", "32"))
+STREAM_MAX_BUFFERED = int(os.getenv("STREAM_MAX_BUFFERED", "1000"))
 
 app = FastAPI(
     title="PolicyMe Cortex API",
@@ -28,171 +124,223 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Pydantic models
-class IncidentData(BaseModel):
-    location: str
-    dateTime: str
-    description: str
-    injuries: bool = False
-    propertyDamage: bool = False
-    claimedAmount: Optional[float] = 0.0
-
-class ClaimAnalysisRequest(BaseModel):
-    incidentData: IncidentData
-    policyId: Optional[str] = "POL-001"
-
-class FraudScore(BaseModel):
-    score: float
-    risk_level: str
-    indicators: List[str]
-    confidence: float
-
-class AIAnalysis(BaseModel):
-    validity: str
-    recommendation: str
-    estimated_payout: float
-    red_flags: List[str]
-    reasoning: str
-
-class ClaimAnalysisResponse(BaseModel):
-    claim_id: str
-    fraud_score: FraudScore
-    ai_analysis: AIAnalysis
-    status: str
-    created_at: str
+@app.on_event("startup")
+async def warm_up_llm():
+    if GEMINI_API_KEY and GEMINI_WARMUP:
+        asyncio.get_running_loop().run_in_executor(None, llm.warm_up)
 
 # Helper functions
-def calculate_fraud_score(incident: IncidentData) -> FraudScore:
-    """Calculate fraud risk score using rule-based system"""
-    score = 0.0
-    indicators = []
+def rule_based_analysis(incident: IncidentData, fraud_score: FraudScore, reasoning: str,
+                        analysis_path: str = PATH_RULES) -> AIAnalysis:
+    """Derive an analysis from the fraud score alone (no LLM)"""
+    validity = "needs_review" if fraud_score.score > 40 else "valid"
+    recommendation = "manual_review" if fraud_score.score > 40 else "auto_approve"
+    estimated = (incident.claimedAmount or 0.0) * (0.6 if fraud_score.score > 60 else 0.85)
+    
+    return AIAnalysis(
+        validity=validity,
+        recommendation=recommendation,
+        estimated_payout=round(estimated, 2),
+        red_flags=fraud_score.indicators,
+        reasoning=reasoning,
+        analysis_path=analysis_path
+    )
+
+def llm_error_outcome(error: Exception) -> str:
+    """LLM_CALLS outcome label for a failed Gemini call"""
+    if isinstance(error, LLMSaturated):
+        return "shed"
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    return "error"
+
+async def gemini_analysis(incident: IncidentData, fraud_score: FraudScore, cache_key: str,
+                          background: bool = False) -> AIAnalysis:
+    """Run one Gemini analysis and cache it; raises on any LLM or parse error"""
     
-    # High claimed amount relative to description
-    if incident.claimedAmount > 50000:
-        score += 25
-        indicators.append("High claim amount")
+    started = time.perf_counter()
+    prompt = build_analysis_prompt(incident, fraud_score)
+    STAGE_PROMPT_BUILD.observe(time.perf_counter() - started)
     
-    # Vague or suspicious description
-    if len(incident.description) < 50:
-        score += 15
-        indicators.append("Insufficient details")
-    elif any(word in incident.description.lower() for word in ['stolen', 'total loss', 'fire', 'flood']):
-        score += 20
-        indicators.append("High-risk incident type")
+    started = time.perf_counter()
+    try:
+        result_text = (await llm.generate(
+            prompt, priority=claim_priority(incident, fraud_score, background), background=background
+        )).strip()
+    except Exception as e:
+        LLM_CALLS.labels(llm_error_outcome(e)).inc()
+        raise
+    finally:
+        STAGE_LLM_CALL.observe(time.perf_counter() - started)
     
-    # Weekend/holiday timing (simplified)
+    # Parse JSON from response
+    started = time.perf_counter()
     try:
-        incident_dt = datetime.fromisoformat(incident.dateTime.replace('Z', '+00:00'))
-        if incident_dt.weekday() >= 5:  # Saturday or Sunday
-            score += 10
-            indicators.append("Weekend incident")
-    except:
-        pass
+        analysis = parse_analysis(result_text, incident, fraud_score)
+    except Exception:
+        LLM_CALLS.labels("parse_failure").inc()
+        LLM_WASTED_TOKENS.inc(estimate_tokens(prompt) + estimate_tokens(result_text))
+        raise
+    finally:
+        STAGE_JSON_EXTRACTION.observe(time.perf_counter() - started)
+    
+    LLM_CALLS.labels("success").inc()
+    llm_cache.set(cache_key, analysis.model_dump(exclude={"analysis_path"}))
+    return analysis
+
+async def gemini_batch_analysis(claims: List[tuple]) -> List[Any]:
+    """Analyze several (incident, fraud_score, cache_key, background) claims in one prompt.
+    
+    Claims missing from a malformed or partial reply are retried one by one.
+    Returns an AIAnalysis or the exception for each claim, in order.
+    """
+    if len(claims) == 1:
+        try:
+            return [await gemini_analysis(*claims[0])]
+        except Exception as e:
+            return [e]
     
-    # Both injuries and property damage
-    if incident.injuries and incident.propertyDamage:
-        score += 15
-        indicators.append("Multiple damage types")
+    started = time.perf_counter()
+    prompt = build_batch_prompt([(incident, fraud_score) for incident, fraud_score, _, _ in claims])
+    STAGE_PROMPT_BUILD.observe(time.perf_counter() - started)
+    LLM_MICROBATCH_SIZE.observe(len(claims))
     
-    # Location anomalies (placeholder logic)
-    if not incident.location or len(incident.location) < 5:
-        score += 10
-        indicators.append("Vague location")
+    started = time.perf_counter()
+    try:
+        result_text = await llm.generate(
+            prompt, priority=max(claim_priority(*claim[:2], background=claim[3]) for claim in claims),
+            background=all(claim[3] for claim in claims)
+        )
+    except Exception as e:
+        LLM_CALLS.labels(llm_error_outcome(e)).inc(len(claims))
+        return [e] * len(claims)
+    finally:
+        STAGE_LLM_CALL.observe(time.perf_counter() - started)
     
-    score = min(score, 100.0)
+    started = time.perf_counter()
+    try:
+        analyses = parse_batch_analyses(result_text, [(incident, fraud_score) for incident, fraud_score, _, _ in claims])
+    except LLMParseError:
+        analyses = {}
+    STAGE_JSON_EXTRACTION.observe(time.perf_counter() - started)
     
-    if score < 30:
-        risk_level = "Low"
-        confidence = 0.85
-    elif score < 60:
-        risk_level = "Medium"
-        confidence = 0.75
+    missing = [index for index in range(len(claims)) if index not in analyses]
+    if not missing:
+        LLM_MICROBATCHES.labels("complete").inc()
     else:
-        risk_level = "High"
-        confidence = 0.90
+        LLM_MICROBATCHES.labels("partial" if analyses else "malformed").inc()
+        LLM_CALLS.labels("parse_failure").inc(len(missing))
     
-    return FraudScore(
-        score=round(score, 2),
-        risk_level=risk_level,
-        indicators=indicators,
-        confidence=confidence
+    results: List[Any] = [None] * len(claims)
+    for index, analysis in analyses.items():
+        LLM_CALLS.labels("success").inc()
+        llm_cache.set(claims[index][2], analysis.model_dump(exclude={"analysis_path"}))
+        results[index] = analysis
+    retried = await asyncio.gather(
+        *(gemini_analysis(*claims[index]) for index in missing), return_exceptions=True
     )
+    for index, result in zip(missing, retried):
+        results[index] = result
+    return results
 
-async def ai_analyze_claim(incident: IncidentData, fraud_score: FraudScore) -> AIAnalysis:
-    """Use Gemini AI to analyze claim validity and provide recommendations"""
-    
+# Concurrent claims share one Gemini prompt when LLM_MICROBATCH_SIZE > 1
+analysis_batcher = MicroBatcher(gemini_batch_analysis)
+
+def analyze_with_llm(incident: IncidentData, fraud_score: FraudScore, cache_key: str,
+                     background: bool = False) -> Awaitable[AIAnalysis]:
+    """Gemini analysis of one claim, micro-batched with concurrent claims when enabled"""
+    if analysis_batcher.enabled:
+        return analysis_batcher.submit((incident, fraud_score, cache_key, background))
+    return gemini_analysis(incident, fraud_score, cache_key, background)
+
+async def review_claim(incident: IncidentData, fraud_score: FraudScore, cache_key: str, claim_id: str) -> None:
+    """Background LLM review of a claim already answered by rules; the result replaces the stored analysis"""
+    # Reviews get their own flight: an interactive retry of the same claim must
+    # not join a call that waits for quota at background priority with no deadline
+    analysis = await llm_inflight.do(
+        f"review:{cache_key}", lambda: analyze_with_llm(incident, fraud_score, cache_key, background=True)
+    )
+    await apply_review(claim_id, analysis.model_copy(deep=True))
+
+async def apply_review(claim_id: str, ai_analysis: AIAnalysis) -> None:
+    """Write a finished review back to the claim store, the dashboard and the claim's job, if any"""
+    stored = await claim_store.get(claim_id)
+    job = await job_runner.store.get(claim_id)
+    previous = stored.response if stored is not None else job.result if job is not None else None
+    if previous is None:
+        return
+    response = previous.model_copy(update={
+        "ai_analysis": ai_analysis,
+        "status": claim_status(previous.fraud_score, ai_analysis)
+    })
+    if stored is not None:
+        claim_store.record(stored.request, response, replaces=previous)
+    dashboard_stats.revise(previous, response)
+    if job is not None and job.result is not None:
+        await job_runner.store.put(job.model_copy(update={"result": response}))
+
+def defer_analysis(incident: IncidentData, fraud_score: FraudScore, cache_key: str, claim_id: str,
+                   reasoning: str) -> AIAnalysis:
+    """Queue a background LLM review and answer with a rule-based analysis"""
+    if not review_queue.submit(lambda: review_claim(incident, fraud_score, cache_key, claim_id)):
+        return rule_based_analysis(
+            incident, fraud_score, "Rule-based decision issued; AI review skipped, the review queue is full."
+        )
+    return rule_based_analysis(incident, fraud_score, reasoning, analysis_path=PATH_DEFERRED)
+
+async def ai_analyze_claim(incident: IncidentData, fraud_score: FraudScore, claim_id: str) -> AIAnalysis:
+    """Use Gemini AI to analyze claim validity and provide recommendations.
+
+    A deferred review later replaces the analysis stored under claim_id.
+    """
+    analysis = await _ai_analyze_claim(incident, fraud_score, claim_id)
+    ANALYSIS_PATHS.labels(analysis.analysis_path).inc()
+    return analysis
+
+async def _ai_analyze_claim(incident: IncidentData, fraud_score: FraudScore, claim_id: str) -> AIAnalysis:
     if not GEMINI_API_KEY:
         # Fallback logic when API key is not configured
-        validity = "needs_review" if fraud_score.score > 40 else "valid"
-        recommendation = "manual_review" if fraud_score.score > 40 else "auto_approve"
-        estimated = incident.claimedAmount * (0.6 if fraud_score.score > 60 else 0.85)
-        
-        return AIAnalysis(
-            validity=validity,
-            recommendation=recommendation,
-            estimated_payout=round(estimated, 2),
-            red_flags=fraud_score.indicators,
-            reasoning="Automated analysis based on rule-based system. Configure GEMINI_API_KEY for advanced AI insights."
+        return rule_based_analysis(
+            incident, fraud_score,
+            "Automated analysis based on rule-based system. Configure GEMINI_API_KEY for advanced AI insights."
         )
     
-    # Use Gemini AI for advanced analysis
-    prompt = f"""You are an insurance claims adjuster AI. Analyze this claim:
-
-Incident Details:
-- Location: {incident.location}
-- Date/Time: {incident.dateTime}
-- Description: {incident.description}
-- Injuries Reported: {incident.injuries}
-- Property Damage: {incident.propertyDamage}
-- Claimed Amount: ${incident.claimedAmount}
-
-Fraud Risk Score: {fraud_score.score}/100 ({fraud_score.risk_level} risk)
-Fraud Indicators: {', '.join(fraud_score.indicators)}
-
-Provide your analysis in this exact JSON format:
-{{
-    "validity": "valid" or "questionable" or "invalid",
-    "recommendation": "auto_approve" or "manual_review" or "reject",
-    "estimated_payout": numeric value,
-    "red_flags": ["flag1", "flag2"],
-    "reasoning": "brief explanation"
-}}
-
-Be concise and objective."""
+    # Identical claims reuse a previous analysis instead of paying for another call
+    cache_key = claim_cache_key(incident, fraud_score, PROMPT_CACHE_VERSION)
+    cached = await llm_cache.get(cache_key)
+    if cached is not None:
+        return AIAnalysis(**cached, analysis_path=PATH_CACHE)
+    
+    # Clear-cut claims skip the synchronous LLM round trip
+    path = routing_policy.route(incident, fraud_score)
+    if path == PATH_RULES:
+        return rule_based_analysis(
+            incident, fraud_score, "Low-risk claim settled by rule-based analysis."
+        )
+    if path == PATH_DEFERRED:
+        return defer_analysis(incident, fraud_score, cache_key, claim_id, "Rule-based decision issued; AI review queued.")
     
     try:
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-        
-        # Parse JSON from response
-        import json
-        if "```json" in result_text:
-            result_text = result_text.split("```json")[1].split("```")[0]
-        elif "```" in result_text:
-            result_text = result_text.split("```")[1].split("```")[0]
-        
-        ai_result = json.loads(result_text.strip())
-        
-        return AIAnalysis(
-            validity=ai_result.get("validity", "needs_review"),
-            recommendation=ai_result.get("recommendation", "manual_review"),
-            estimated_payout=float(ai_result.get("estimated_payout", incident.claimedAmount * 0.8)),
-            red_flags=ai_result.get("red_flags", fraud_score.indicators),
-            reasoning=ai_result.get("reasoning", "AI analysis completed")
+        # Concurrent identical claims share a single Gemini call
+        analysis = await llm_inflight.do(
+            cache_key, lambda: analyze_with_llm(incident, fraud_score, cache_key)
+        )
+        return analysis.model_copy(deep=True)
+    except LLMSaturated:
+        # Over quota: decide by rules now and let the LLM catch up in the background
+        return defer_analysis(
+            incident, fraud_score, cache_key, claim_id,
+            "Rule-based decision issued; AI review queued while the LLM quota is saturated."
         )
     except Exception as e:
         print(f"Gemini AI error: {e}")
+        LLM_FALLBACKS.inc()
         # Fallback to rule-based
-        validity = "needs_review" if fraud_score.score > 40 else "valid"
-        recommendation = "manual_review" if fraud_score.score > 40 else "auto_approve"
-        estimated = incident.claimedAmount * (0.6 if fraud_score.score > 60 else 0.85)
-        
-        return AIAnalysis(
-            validity=validity,
-            recommendation=recommendation,
-            estimated_payout=round(estimated, 2),
-            red_flags=fraud_score.indicators,
-            reasoning=f"AI analysis fallback due to error: {str(e)}"
+        return rule_based_analysis(
+            incident, fraud_score, f"AI analysis fallback due to error: {str(e) or type(e).__name__}",
+            analysis_path=PATH_FALLBACK
         )
 
 # API Routes
@@ -210,53 +358,268 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "gemini_configured": bool(GEMINI_API_KEY)
+        "gemini_configured": bool(GEMINI_API_KEY),
+        "gemini_loaded": llm.model_loaded if GEMINI_API_KEY else False,
+        "fraud_rules_version": fraud_rules.rule_set.version,
+        "holiday_calendar_version": fraud_calendar.version,
+        "llm_in_flight": llm.in_flight if GEMINI_API_KEY else 0,
+        "llm_circuit_breaker": llm_breaker.snapshot(),
+        "llm_scheduler": llm_scheduler.stats(),
+        "llm_hedging": llm_hedge.stats(),
+        "llm_microbatching": analysis_batcher.stats(),
+        "llm_cache": llm_cache.stats(),
+        "llm_coalescing": llm_inflight.stats(),
+        "llm_routing": routing_policy.counts,
+        "llm_review_queue": review_queue.stats(),
+        "job_queue_depth": job_runner.queue_depth,
+        "claim_store": claim_store.stats()
     }
 
+def score_claim(incident: IncidentData) -> FraudScore:
+    """Rule-based fraud scoring, timed and counted by risk level"""
+    started = time.perf_counter()
+    fraud_score = calculate_fraud_score(incident)
+    STAGE_RULE_SCORING.observe(time.perf_counter() - started)
+    CLAIMS_BY_RISK.labels(fraud_score.risk_level).inc()
+    return fraud_score
+
+def claim_status(fraud_score: FraudScore, ai_analysis: AIAnalysis) -> str:
+    """Derive claim status from the fraud score and AI analysis"""
+    if ai_analysis.recommendation == "auto_approve" and fraud_score.score < 30:
+        return "approved"
+    if ai_analysis.recommendation == "reject" or fraud_score.score > 80:
+        return "flagged"
+    return "processing"
+
+def build_claim_response(fraud_score: FraudScore, ai_analysis: AIAnalysis,
+                         claim_id: Optional[str] = None) -> ClaimAnalysisResponse:
+    """Assemble the response for an analyzed claim"""
+    started = time.perf_counter()
+    
+    response = ClaimAnalysisResponse(
+        claim_id=claim_id or new_claim_id(),
+        fraud_score=fraud_score,
+        ai_analysis=ai_analysis,
+        status=claim_status(fraud_score, ai_analysis),
+        created_at=datetime.utcnow().isoformat()
+    )
+    STAGE_RESPONSE_BUILD.observe(time.perf_counter() - started)
+    return response
+
+def invalid_claim_message(error: ValidationError) -> str:
+    """Summarize the first validation error of a claim for a batch/stream item"""
+    first = error.errors()[0]
+    field = ".".join(str(part) for part in first["loc"])
+    return f"Invalid claim: {field}: {first['msg']}" if field else f"Invalid claim: {first['msg']}"
+
+def record_claim(request: ClaimAnalysisRequest, response: ClaimAnalysisResponse, started: float) -> None:
+    """Persist a finished claim and fold it into the dashboard aggregates"""
+    claim_store.record(request, response)
+    dashboard_stats.record(response, time.perf_counter() - started)
+
 @app.post("/api/claims/analyze", response_model=ClaimAnalysisResponse)
 async def analyze_claim(request: ClaimAnalysisRequest):
     """Analyze insurance claim for fraud and validity"""
+    started = time.perf_counter()
     
     # Calculate fraud score
-    fraud_score = calculate_fraud_score(request.incidentData)
+    fraud_score = score_claim(request.incidentData)
     
     # Get AI analysis
-    ai_analysis = await ai_analyze_claim(request.incidentData, fraud_score)
+    claim_id = new_claim_id()
+    ai_analysis = await ai_analyze_claim(request.incidentData, fraud_score, claim_id)
     
-    # Determine claim status
-    if ai_analysis.recommendation == "auto_approve" and fraud_score.score < 30:
-        status = "approved"
-    elif ai_analysis.recommendation == "reject" or fraud_score.score > 80:
-        status = "flagged"
-    else:
-        status = "processing"
+    response = build_claim_response(fraud_score, ai_analysis, claim_id)
+    record_claim(request, response, started)
+    STAGE_ANALYZE_TOTAL.observe(time.perf_counter() - started)
+    return FastJSONResponse(response)
+
+@app.post("/api/claims/analyze:batch", response_model=BatchAnalysisResponse)
+async def analyze_claims_batch(claims: List[Dict[str, Any]]):
+    """Analyze a list of claims in one request, preserving input order"""
+    
+    if len(claims) > BATCH_MAX_CLAIMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(claims)} claims (max {BATCH_MAX_CLAIMS})"
+        )
     
-    # Generate claim ID
-    claim_id = f"CLM-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+    results: List[BatchItemResult] = [BatchItemResult(index=i) for i in range(len(claims))]
     
-    return ClaimAnalysisResponse(
-        claim_id=claim_id,
+    # Validate and score every claim in a single pass before any LLM work starts
+    scored = []
+    for i, raw in enumerate(claims):
+        started = time.perf_counter()
+        try:
+            request = ClaimAnalysisRequest.model_validate(raw)
+        except ValidationError as e:
+            results[i].error = invalid_claim_message(e)
+            continue
+        scored.append((i, request, score_claim(request.incidentData), time.perf_counter() - started))
+    
+    # Fan LLM calls out concurrently, bounded by the in-flight window
+    window = asyncio.Semaphore(BATCH_MAX_IN_FLIGHT)
+    
+    async def analyze_item(index: int, request: ClaimAnalysisRequest, fraud_score: FraudScore,
+                           scoring_seconds: float):
+        async with window:
+            # Processing time is this claim's own scoring plus analysis, not time spent queued
+            started = time.perf_counter() - scoring_seconds
+            try:
+                claim_id = new_claim_id()
+                ai_analysis = await ai_analyze_claim(request.incidentData, fraud_score, claim_id)
+                results[index].result = build_claim_response(fraud_score, ai_analysis, claim_id)
+                record_claim(request, results[index].result, started)
+            except Exception as e:
+                results[index].error = f"Analysis failed: {str(e)}"
+    
+    await asyncio.gather(*(analyze_item(*item) for item in scored))
+    
+    failed = sum(1 for r in results if r.error is not None)
+    return FastJSONResponse(BatchAnalysisResponse(
+        total=len(results),
+        succeeded=len(results) - failed,
+        failed=failed,
+        results=results
+    ))
+
+@app.post("/api/claims/analyze:stream", response_class=NDJSONStreamResponse)
+async def analyze_claims_stream(request: Request):
+    """Analyze NDJSON claims as they stream in, streaming NDJSON results back as each finishes"""
+    
+    async def results():
+        # A claim holds its window slot until its result line is queued, and the
+        # queue holds at most STREAM_MAX_BUFFERED lines. Once both are full,
+        # reading the body pauses until the client reads results, so memory is
+        # bounded however large the body is.
+        window = asyncio.Semaphore(STREAM_MAX_IN_FLIGHT)
+        finished: asyncio.Queue = asyncio.Queue(maxsize=max(1, STREAM_MAX_BUFFERED))
+        tasks = set()
+        
+        async def analyze_item(index: int, claim: ClaimAnalysisRequest, fraud_score: FraudScore,
+                               scoring_seconds: float):
+            item = BatchItemResult(index=index)
+            started = time.perf_counter() - scoring_seconds
+            try:
+                try:
+                    claim_id = new_claim_id()
+                    ai_analysis = await ai_analyze_claim(claim.incidentData, fraud_score, claim_id)
+                    item.result = build_claim_response(fraud_score, ai_analysis, claim_id)
+                    record_claim(claim, item.result, started)
+                except Exception as e:
+                    item.error = f"Analysis failed: {str(e)}"
+                await finished.put(item.model_dump_json() + "\n")
+            finally:
+                window.release()
+        
+        async def read_claims():
+            index = -1
+            try:
+                async for line in iter_ndjson_lines(request.stream()):
+                    index += 1
+                    if line is None:
+                        item = BatchItemResult(index=index, error="Invalid claim: line too long")
+                        await finished.put(item.model_dump_json() + "\n")
+                        continue
+                    try:
+                        claim = ClaimAnalysisRequest.model_validate_json(line)
+                    except ValidationError as e:
+                        item = BatchItemResult(index=index, error=invalid_claim_message(e))
+                        await finished.put(item.model_dump_json() + "\n")
+                        continue
+                    started = time.perf_counter()
+                    fraud_score = score_claim(claim.incidentData)
+                    scoring_seconds = time.perf_counter() - started
+                    await window.acquire()
+                    task = asyncio.ensure_future(analyze_item(index, claim, fraud_score, scoring_seconds))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                if tasks:
+                    await asyncio.wait(set(tasks))
+            except Exception:
+                # Not on cancellation: then the response is gone and nobody reads the end marker
+                await finished.put(None)
+                raise
+            await finished.put(None)
+        
+        reader = asyncio.ensure_future(read_claims())
+        try:
+            while True:
+                line = await finished.get()
+                if line is None:
+                    break
+                yield line
+            await reader  # surfaces body read errors
+        finally:
+            reader.cancel()
+            for task in list(tasks):
+                task.cancel()
+    
+    return NDJSONStreamResponse(results())
+
+@app.post("/api/claims/analyze:submit", response_model=ClaimJob, status_code=202)
+async def submit_claim_analysis(request: ClaimAnalysisRequest):
+    """Score a claim and queue its AI analysis; poll GET /api/claims/{claim_id} for the result"""
+    
+    fraud_score = score_claim(request.incidentData)
+    job = ClaimJob(
+        claim_id=new_claim_id(),
+        status=JOB_QUEUED,
         fraud_score=fraud_score,
-        ai_analysis=ai_analysis,
-        status=status,
-        created_at=datetime.utcnow().isoformat()
+        submitted_at=datetime.utcnow().isoformat()
     )
+    
+    async def run_analysis() -> ClaimAnalysisResponse:
+        started = time.perf_counter()
+        ai_analysis = await ai_analyze_claim(request.incidentData, fraud_score, job.claim_id)
+        response = build_claim_response(fraud_score, ai_analysis, job.claim_id)
+        record_claim(request, response, started)
+        return response
+    
+    try:
+        await job_runner.submit(job, run_analysis)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Analysis queue is full, retry later")
+    return FastJSONResponse(job, status_code=202)
+
+@app.get("/api/claims", response_model=ClaimPage)
+async def list_claims(policyId: Optional[str] = None, status: Optional[str] = None,
+                      limit: int = Query(50, ge=1, le=500), cursor: Optional[str] = None):
+    """Page through analyzed claims, newest first"""
+    claims, next_cursor = await claim_store.list(
+        policy_id=policyId, status=status, limit=limit, cursor=cursor
+    )
+    return FastJSONResponse(ClaimPage(claims=claims, next_cursor=next_cursor))
+
+@app.get("/api/claims/{claim_id}", response_model=ClaimJob)
+async def get_claim(claim_id: str):
+    """Get the status and result of a claim analysis"""
+    job = await job_runner.store.get(claim_id)
+    if job is not None:
+        return FastJSONResponse(job)
+    
+    stored = await claim_store.get(claim_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Claim {claim_id} not found")
+    response = stored.response
+    return FastJSONResponse(ClaimJob(
+        claim_id=response.claim_id,
+        status=JOB_COMPLETED,
+        fraud_score=response.fraud_score,
+        result=response,
+        submitted_at=response.created_at,
+        completed_at=response.created_at
+    ))
 
 @app.get("/api/dashboard/stats")
 async def get_dashboard_stats():
-    """Get dashboard statistics (mock data for now)"""
-    return {
-        "active_claims": 247,
-        "fraud_detected": 12,
-        "processing_time": "2.3s",
-        "approval_rate": 78.5,
-        "total_payout": 1250000.00,
-        "risk_distribution": {
-            "low": 156,
-            "medium": 73,
-            "high": 18
-        }
-    }
+    """Get dashboard statistics from incrementally maintained aggregates"""
+    return FastJSONResponse(await dashboard_stats.snapshot())
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of stage latencies, LLM outcomes and queue gauges"""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,286 @@
+# api/metrics.py - Low-overhead metrics with Prometheus text exposition
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # the response class appends the charset
+
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class _ShardedValues:
+    """Fixed-size float arrays, one per thread, summed only when scraped.
+
+    Writers touch only their own thread's list, so the hot path takes no lock;
+    the lock is held once per thread (on first use) and during scrapes.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._shards: List[List[float]] = []
+        self._lock = threading.Lock()
+
+    def local(self) -> List[float]:
+        values = getattr(self._local, "values", None)
+        if values is None:
+            values = [0.0] * self._size
+            with self._lock:
+                self._shards.append(values)
+            self._local.values = values
+        return values
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            shards = list(self._shards)
+        totals = [0.0] * self._size
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._children_lock = threading.Lock()
+
+    def labels(self, *values: str):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._children_lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child()
+                    self._children[key] = child
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(line + "\n" for line in self._samples())
+
+
+class _CounterChild:
+    def __init__(self):
+        self._values = _ShardedValues(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._values.local()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._values.totals()[0]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+            for key, child in list(self._children.items())
+        ]
+
+
+class Gauge(_Metric):
+    """Gauge read from a callback at scrape time, so updates cost nothing"""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, fn: Callable[[], float]):
+        super().__init__(name, documentation)
+        self._fn = fn
+
+    def _samples(self) -> List[str]:
+        try:
+            value = float(self._fn())
+        except Exception:
+            return []
+        return [f"{self.name} {_format_value(value)}"]
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+        # One slot per bucket, one for +Inf, then the running sum
+        self._values = _ShardedValues(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        values = self._values.local()
+        values[bisect.bisect_left(self._buckets, value)] += 1
+        values[-1] += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, child in list(self._children.items()):
+            totals = child._values.totals()
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), totals[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(totals[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, fn: Callable[[], float]) -> Gauge:
+        metric = Gauge(name, documentation, fn)
+        self.register(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Optional[Sequence[float]] = None) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets or LATENCY_BUCKETS)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        return "".join(metric.render() for metric in self._metrics)
+
+
+registry = Registry()
+
+# Shared instruments; gauges are registered by the modules that own the state
+STAGE_LATENCY = registry.histogram(
+    "cortex_stage_duration_seconds",
+    "Latency of each claim analysis stage",
+    ("stage",),
+)
+LLM_CALLS = registry.counter(
+    "cortex_llm_calls_total",
+    "Gemini analyses by outcome (success, error, timeout, circuit_open, shed, parse_failure)",
+    ("outcome",),
+)
+LLM_FALLBACKS = registry.counter(
+    "cortex_llm_fallbacks_total",
+    "Analyses that fell back to the rule-based path after an LLM error",
+)
+CLAIMS_BY_RISK = registry.counter(
+    "cortex_claims_total",
+    "Analyzed claims by fraud risk level",
+    ("risk_level",),
+)
+ANALYSIS_PATHS = registry.counter(
+    "cortex_analysis_path_total",
+    "Analyses by path taken (llm, cache, rules, deferred_llm, fallback)",
+    ("path",),
+)
+LLM_QUEUE_WAIT = registry.histogram(
+    "cortex_llm_queue_wait_seconds",
+    "Time LLM calls waited for Gemini quota",
+)
+LLM_SHED = registry.counter(
+    "cortex_llm_shed_total",
+    "LLM calls shed by the quota scheduler (queue_full, evicted, timeout)",
+    ("reason",),
+)
+LLM_HEDGES = registry.counter(
+    "cortex_llm_hedges_total",
+    "Hedged Gemini requests by result (hedge_won, primary_won, skipped)",
+    ("result",),
+)
+LLM_PARSE = registry.counter(
+    "cortex_llm_parse_total",
+    "Gemini replies by parse result (direct, scanned, no_json, invalid_json, invalid_fields)",
+    ("result",),
+)
+LLM_WASTED_TOKENS = registry.counter(
+    "cortex_llm_wasted_tokens_total",
+    "Estimated prompt and reply tokens of Gemini calls whose reply could not be parsed",
+)
+PROMPT_TOKENS = registry.histogram(
+    "cortex_prompt_tokens",
+    "Estimated tokens per analysis prompt",
+    buckets=(64, 128, 256, 384, 512, 768, 1024, 2048, 4096, 8192),
+)
+PROMPTS_TRUNCATED = registry.counter(
+    "cortex_prompts_truncated_total",
+    "Analysis prompts whose description was trimmed to the token budget",
+)
+LLM_MICROBATCHES = registry.counter(
+    "cortex_llm_microbatches_total",
+    "Multi-claim Gemini prompts by reply result (complete, partial, malformed)",
+    ("result",),
+)
+LLM_MICROBATCH_SIZE = registry.histogram(
+    "cortex_llm_microbatch_size",
+    "Claims per multi-claim Gemini prompt",
+    buckets=(2, 4, 8, 16, 32, 64),
+)
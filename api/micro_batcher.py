@@ -0,0 +1,80 @@
+# api/micro_batcher.py - Coalesce calls arriving within a short window into one batch
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Generic, List, Optional, Set, Tuple, TypeVar, Union
+
+# Max claims per LLM prompt; 1 disables micro-batching
+LLM_MICROBATCH_SIZE = int(os.getenv("LLM_MICROBATCH_SIZE", "1"))
+LLM_MICROBATCH_WAIT_MS = float(os.getenv("LLM_MICROBATCH_WAIT_MS", "5"))
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collects submissions for up to max_wait seconds (or max_size items) and
+    hands them to process as one list.
+
+    process returns one result per item, in order; an Exception in a slot is
+    raised to that item's caller only.
+    """
+
+    def __init__(self, process: Callable[[List[T]], Awaitable[List[Union[R, Exception]]]],
+                 max_size: int = LLM_MICROBATCH_SIZE,
+                 max_wait: float = LLM_MICROBATCH_WAIT_MS / 1000.0):
+        self._process = process
+        self.max_size = max(1, max_size)
+        self.max_wait = max_wait
+        self._pending: List[Tuple[T, "asyncio.Future[R]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set["asyncio.Task[None]"] = set()
+        self.batches = 0
+        self.items = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 1
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[R]" = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[T, "asyncio.Future[R]"]]) -> None:
+        try:
+            results: List[Any] = await self._process([item for item, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():  # the caller gave up
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "batches": self.batches,
+            "claims": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
@@ -0,0 +1,64 @@
+# api/models.py - Pydantic request/response models
+from pydantic import BaseModel
+from typing import Optional, List
+
+class IncidentData(BaseModel):
+    location: str
+    dateTime: str
+    description: str
+    injuries: bool = False
+    propertyDamage: bool = False
+    claimedAmount: Optional[float] = 0.0
+
+class ClaimAnalysisRequest(BaseModel):
+    incidentData: IncidentData
+    policyId: Optional[str] = "POL-001"
+
+class FraudScore(BaseModel):
+    score: float
+    risk_level: str
+    indicators: List[str]
+    confidence: float
+
+class AIAnalysis(BaseModel):
+    validity: str
+    recommendation: str
+    estimated_payout: float
+    red_flags: List[str]
+    reasoning: str
+    analysis_path: str = "llm"
+
+class ClaimAnalysisResponse(BaseModel):
+    claim_id: str
+    fraud_score: FraudScore
+    ai_analysis: AIAnalysis
+    status: str
+    created_at: str
+
+class BatchItemResult(BaseModel):
+    index: int
+    result: Optional[ClaimAnalysisResponse] = None
+    error: Optional[str] = None
+
+class BatchAnalysisResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
+
+class ClaimJob(BaseModel):
+    claim_id: str
+    status: str
+    fraud_score: FraudScore
+    result: Optional[ClaimAnalysisResponse] = None
+    error: Optional[str] = None
+    submitted_at: str
+    completed_at: Optional[str] = None
+
+class StoredClaim(BaseModel):
+    request: ClaimAnalysisRequest
+    response: ClaimAnalysisResponse
+
+class ClaimPage(BaseModel):
+    claims: List[StoredClaim]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,62 @@
+# api/ndjson.py - Incremental newline-delimited JSON over streamed request/response bodies
+import os
+from typing import AsyncIterator, Optional
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_MAX_LINE_BYTES = int(os.getenv("NDJSON_MAX_LINE_BYTES", str(1024 * 1024)))
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes],
+                            max_line_bytes: int = NDJSON_MAX_LINE_BYTES) -> AsyncIterator[Optional[bytes]]:
+    """Split a byte stream into non-blank lines as the chunks arrive.
+
+    Only the current partial line is buffered. A line longer than
+    max_line_bytes is skipped and reported as None, so one bad record
+    cannot make the buffer grow without bound.
+    """
+    buffer = bytearray()
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            if oversized:
+                oversized = False
+                yield None
+            else:
+                buffer += chunk[start:end]
+                if len(buffer) > max_line_bytes:
+                    yield None
+                elif buffer.strip():
+                    yield bytes(buffer)
+            buffer.clear()
+            start = end + 1
+        if not oversized:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                oversized = True
+                buffer.clear()
+    if oversized:
+        yield None
+    elif buffer.strip():
+        yield bytes(buffer)
+
+
+class NDJSONStreamResponse(StreamingResponse):
+    """Streams response lines while the request body is still being read.
+
+    StreamingResponse watches for client disconnects by consuming receive(),
+    which would swallow the request body the generator is reading. Here the
+    body reader sees the disconnect itself (as ClientDisconnect).
+    """
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
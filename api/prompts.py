@@ -0,0 +1,220 @@
+# api/prompts.py - Versioned, precompiled LLM prompt templates with token budgeting
+import os
+import re
+import string
+from typing import Any, Dict, List, Tuple
+
+from models import IncidentData, FraudScore
+from metrics import PROMPT_TOKENS, PROMPTS_TRUNCATED
+from scoring import scan_description
+
+# Descriptions estimated above this many tokens are trimmed before prompting
+PROMPT_DESCRIPTION_TOKEN_BUDGET = int(os.getenv("PROMPT_DESCRIPTION_TOKEN_BUDGET", "512"))
+
+ELISION = " [...] "
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English prose
+    return len(text) // 4 + 1
+
+
+class PromptTemplate:
+    """A str.format-style template compiled once into a join over its literals.
+
+    Placeholders are rendered with str(); the template version goes into LLM
+    cache keys, so edit the text only together with the version.
+    """
+
+    def __init__(self, version: str, text: str):
+        self.version = version
+        self.text = text
+        pieces: List[str] = []
+        fields: List[str] = []
+        namespace: Dict[str, Any] = {}
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            if literal:
+                namespace[f"_L{len(pieces)}"] = literal
+                pieces.append(f"_L{len(pieces)}")
+            if field is not None:
+                if spec or conversion or not field.isidentifier():
+                    raise ValueError(f"Unsupported placeholder in prompt template: {field!r}")
+                if field not in fields:
+                    fields.append(field)
+                pieces.append(f"str({field})")
+        self.fields = tuple(fields)
+        source = (
+            f"def render({', '.join(fields)}):\n"
+            f"    return ''.join(({', '.join(pieces)},))\n"
+        )
+        exec(compile(source, f"<prompt {version}>", "exec"), namespace)
+        self.render = namespace["render"]
+
+
+def _sentences(text: str) -> List[Tuple[int, int]]:
+    spans = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        spans.append((start, match.start()))
+        start = match.end()
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+
+def _cut_words(text: str, max_chars: int) -> str:
+    """Keep the head and tail of a single run of text, cut on word boundaries"""
+    head_chars = max_chars * 2 // 3
+    tail_chars = max_chars - head_chars - len(ELISION)
+    head = text[:head_chars].rsplit(" ", 1)[0] if " " in text[:head_chars] else text[:head_chars]
+    tail = text[-tail_chars:].split(" ", 1)[-1] if tail_chars > 0 else ""
+    return head + ELISION + tail
+
+
+def trim_description(description: str, token_budget: int = PROMPT_DESCRIPTION_TOKEN_BUDGET) -> Tuple[str, bool]:
+    """Fit a description into token_budget; returns (text, truncated).
+
+    Whole sentences are kept in their original order, chosen in priority
+    order: the first and last sentence, then any sentence containing a
+    high-risk lexicon phrase, then the rest from the start. Gaps are marked
+    with ELISION. A single over-long sentence is cut to its head and tail.
+    """
+    if token_budget <= 0 or estimate_tokens(description) <= token_budget:
+        return description, False
+    description = " ".join(description.split())
+    max_chars = token_budget * 4
+
+    spans = _sentences(description)
+    if len(spans) == 1:
+        return _cut_words(description, max_chars), True
+
+    flagged = {
+        index for match in scan_description(description)
+        for index, (start, end) in enumerate(spans) if start <= match.start < end
+    }
+    last = len(spans) - 1
+    order = [0, last] + sorted(flagged - {0, last}) + [i for i in range(1, last) if i not in flagged]
+
+    chosen = set()
+    used = 0
+    for index in order:
+        start, end = spans[index]
+        cost = end - start + len(ELISION)
+        if used + cost > max_chars:
+            continue
+        chosen.add(index)
+        used += cost
+
+    if not chosen:
+        return _cut_words(description, max_chars), True
+
+    parts: List[str] = []
+    previous = -1
+    for index in sorted(chosen):
+        if index > previous + 1:
+            parts.append(ELISION.strip())
+        start, end = spans[index]
+        parts.append(description[start:end])
+        previous = index
+    if previous < last:
+        parts.append(ELISION.strip())
+    return " ".join(parts), True
+
+
+# Bump the version whenever the text changes so cached analyses are not reused
+ANALYSIS_PROMPT = PromptTemplate("v1", """You are an insurance claims adjuster AI. Analyze this claim:
+
+Incident Details:
+- Location: {location}
+- Date/Time: {date_time}
+- Description: {description}
+- Injuries Reported: {injuries}
+- Property Damage: {property_damage}
+- Claimed Amount: ${claimed_amount}
+
+Fraud Risk Score: {score}/100 ({risk_level} risk)
+Fraud Indicators: {indicators}
+
+Provide your analysis in this exact JSON format:
+{{
+    "validity": "valid" or "questionable" or "invalid",
+    "recommendation": "auto_approve" or "manual_review" or "reject",
+    "estimated_payout": numeric value,
+    "red_flags": ["flag1", "flag2"],
+    "reasoning": "brief explanation"
+}}
+
+Be concise and objective.""")
+
+
+# Several claims in one prompt, answered as a JSON array keyed by claim number
+BATCH_ANALYSIS_PROMPT = PromptTemplate("batch-v1", """You are an insurance claims adjuster AI. Analyze each of these {count} claims independently:
+
+{claims}
+Respond with only a JSON array holding one object per claim, in this exact format:
+[
+    {{
+        "index": claim number,
+        "validity": "valid" or "questionable" or "invalid",
+        "recommendation": "auto_approve" or "manual_review" or "reject",
+        "estimated_payout": numeric value,
+        "red_flags": ["flag1", "flag2"],
+        "reasoning": "brief explanation"
+    }}
+]
+
+Be concise and objective.""")
+
+BATCH_CLAIM_SECTION = PromptTemplate("batch-v1", """Claim {index}:
+- Location: {location}
+- Date/Time: {date_time}
+- Description: {description}
+- Injuries Reported: {injuries}
+- Property Damage: {property_damage}
+- Claimed Amount: ${claimed_amount}
+- Fraud Risk Score: {score}/100 ({risk_level} risk)
+- Fraud Indicators: {indicators}
+""")
+
+# Cache keys change with the templates and with the trimming budget, since all
+# change what the LLM saw for a given claim. A claim may be answered by either
+# the single-claim or the batch prompt, so both versions are part of the key;
+# BATCH_CLAIM_SECTION shares the batch version.
+PROMPT_CACHE_VERSION = (
+    f"{ANALYSIS_PROMPT.version}+{BATCH_ANALYSIS_PROMPT.version}:d{PROMPT_DESCRIPTION_TOKEN_BUDGET}"
+)
+
+
+def _claim_fields(incident: IncidentData, fraud_score: FraudScore) -> Dict[str, Any]:
+    description, truncated = trim_description(incident.description)
+    if truncated:
+        PROMPTS_TRUNCATED.inc()
+    return {
+        "location": incident.location,
+        "date_time": incident.dateTime,
+        "description": description,
+        "injuries": incident.injuries,
+        "property_damage": incident.propertyDamage,
+        "claimed_amount": incident.claimedAmount,
+        "score": fraud_score.score,
+        "risk_level": fraud_score.risk_level,
+        "indicators": ", ".join(fraud_score.indicators),
+    }
+
+
+def build_analysis_prompt(incident: IncidentData, fraud_score: FraudScore) -> str:
+    prompt = ANALYSIS_PROMPT.render(**_claim_fields(incident, fraud_score))
+    PROMPT_TOKENS.observe(estimate_tokens(prompt))
+    return prompt
+
+
+def build_batch_prompt(claims: List[Tuple[IncidentData, FraudScore]]) -> str:
+    """One prompt for several claims; claim numbers are their positions in claims"""
+    sections = "\n".join(
+        BATCH_CLAIM_SECTION.render(index=index, **_claim_fields(incident, fraud_score))
+        for index, (incident, fraud_score) in enumerate(claims)
+    )
+    prompt = BATCH_ANALYSIS_PROMPT.render(count=len(claims), claims=sections)
+    PROMPT_TOKENS.observe(estimate_tokens(prompt))
+    return prompt
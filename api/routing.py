@@ -0,0 +1,108 @@
+# api/routing.py - Risk-tiered routing between the LLM and the rule-based path
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Set
+
+from models import IncidentData, FraudScore
+
+# Analysis paths recorded on AIAnalysis.analysis_path
+PATH_LLM = "llm"
+PATH_CACHE = "cache"
+PATH_RULES = "rules"
+PATH_DEFERRED = "deferred_llm"
+PATH_FALLBACK = "fallback"
+
+LLM_ROUTE_RULES_MAX_SCORE = float(os.getenv("LLM_ROUTE_RULES_MAX_SCORE", "0"))
+LLM_ROUTE_DEFER_MAX_SCORE = float(os.getenv("LLM_ROUTE_DEFER_MAX_SCORE", "-1"))
+LLM_ROUTE_MAX_AMOUNT = float(os.getenv("LLM_ROUTE_MAX_AMOUNT", "10000"))
+LLM_REVIEW_MAX_PENDING = int(os.getenv("LLM_REVIEW_MAX_PENDING", "1000"))
+# A failed review is retried after LLM_REVIEW_RETRY_SECONDS, doubling each time
+LLM_REVIEW_ATTEMPTS = int(os.getenv("LLM_REVIEW_ATTEMPTS", "3"))
+LLM_REVIEW_RETRY_SECONDS = float(os.getenv("LLM_REVIEW_RETRY_SECONDS", "30"))
+
+
+class RoutingPolicy:
+    """Decide per claim whether it needs a synchronous LLM call.
+
+    Claims above max_amount always go to the LLM. Otherwise a score at or
+    below rules_max_score is settled by rules alone, and a score at or below
+    defer_max_score is settled by rules now with an LLM review queued.
+    A negative threshold disables that band.
+    """
+
+    def __init__(self, rules_max_score: float = LLM_ROUTE_RULES_MAX_SCORE,
+                 defer_max_score: float = LLM_ROUTE_DEFER_MAX_SCORE,
+                 max_amount: float = LLM_ROUTE_MAX_AMOUNT):
+        self.rules_max_score = rules_max_score
+        self.defer_max_score = defer_max_score
+        self.max_amount = max_amount
+        self.counts: Dict[str, int] = {PATH_LLM: 0, PATH_RULES: 0, PATH_DEFERRED: 0}
+
+    def route(self, incident: IncidentData, fraud_score: FraudScore) -> str:
+        path = self._decide(incident.claimedAmount or 0.0, fraud_score.score)
+        self.counts[path] += 1
+        return path
+
+    def _decide(self, amount: float, score: float) -> str:
+        if amount > self.max_amount:
+            return PATH_LLM
+        if score <= self.rules_max_score:
+            return PATH_RULES
+        if score <= self.defer_max_score:
+            return PATH_DEFERRED
+        return PATH_LLM
+
+
+class ReviewQueue:
+    """Runs deferred LLM reviews in the background, retrying failures and shedding work when full"""
+
+    def __init__(self, max_pending: int = LLM_REVIEW_MAX_PENDING, attempts: int = LLM_REVIEW_ATTEMPTS,
+                 retry_seconds: float = LLM_REVIEW_RETRY_SECONDS):
+        self.max_pending = max_pending
+        self.attempts = max(1, attempts)
+        self.retry_seconds = retry_seconds
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+
+    def submit(self, fn: Callable[[], Awaitable[Any]]) -> bool:
+        if len(self._tasks) >= self.max_pending:
+            self.dropped += 1
+            return False
+        task = asyncio.ensure_future(self._run(fn))
+        self._tasks.add(task)
+        task.add_done_callback(self._finished)
+        self.submitted += 1
+        return True
+
+    async def _run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        delay = self.retry_seconds
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return await fn()
+            except Exception:
+                if attempt == self.attempts:
+                    raise
+            self.retried += 1
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    def _finished(self, task: "asyncio.Task[Any]") -> None:
+        self._tasks.discard(task)
+        if task.cancelled() or task.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._tasks),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,255 @@
+# api/rule_engine.py - Declarative fraud rules compiled into a flat Python evaluator
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Features every rule condition can reference, in evaluator argument order
+FEATURES = (
+    "claimed_amount",
+    "description_length",
+    "high_risk_keyword",  # highest weight of matched high-risk phrases, 0 when none
+    "weekday",  # Monday=0, -1 when dateTime is unparseable
+    "injuries",
+    "property_damage",
+    "location_length",
+    "holiday",  # statutory holiday (or its observed day) in the incident's province/state
+    "after_hours",  # incident time inside the calendar's after-hours window
+)
+
+COMPARISON_OPS = {">": ">", ">=": ">=", "<": "<", "<=": "<=", "==": "==", "!=": "!="}
+MEMBERSHIP_OPS = {"in": "in", "not_in": "not in"}
+TRUTH_OPS = ("is_true", "is_false")
+
+
+class RuleError(ValueError):
+    """Raised when a rule file is malformed"""
+
+
+class Rule(NamedTuple):
+    id: str
+    when: Dict[str, Any]
+    weight: float
+    indicator: str
+    group: Optional[str]
+
+
+class RiskBand(NamedTuple):
+    below: Optional[float]  # None on the last, open-ended band
+    level: str
+    confidence: float
+
+
+# (score, risk_level, confidence, indicators)
+Evaluation = Tuple[float, str, float, List[str]]
+
+
+class RuleSet:
+    """A validated rule set plus its compiled evaluator.
+
+    Rules sharing a group are exclusive: the first matching rule in file order
+    wins, like an if/elif chain. Indicators are listed in evaluation order, so
+    column i of bulk_scoring's fired matrix always corresponds to indicators[i].
+    """
+
+    def __init__(self, version: str, rules: List[Rule], risk_bands: List[RiskBand], max_score: float):
+        self.version = version
+        self.rules = rules
+        self.risk_bands = risk_bands
+        self.max_score = max_score
+        self.blocks = _blocks(rules)
+        self.ordered_rules = [rule for block in self.blocks for rule in block]
+        self.indicators = tuple(rule.indicator for rule in self.ordered_rules)
+        try:
+            self.source = _generate_source(self)
+            namespace: Dict[str, Any] = {}
+            exec(compile(self.source, f"<fraud_rules {version}>", "exec"), namespace)
+        except RuleError:
+            raise
+        except (SyntaxError, ValueError, TypeError, AttributeError, RecursionError) as e:
+            # Malformed conditions that slipped past validation must not escape as
+            # anything but RuleError, or a bad hot reload would break scoring
+            raise RuleError(f"Rule set {version} does not compile: {e}") from e
+        self.evaluate: Callable[..., Evaluation] = namespace["evaluate"]
+
+
+def _blocks(rules: List[Rule]) -> List[List[Rule]]:
+    """Order rules into evaluation blocks; a group sits where its first rule appears"""
+    blocks: List[List[Rule]] = []
+    by_group: Dict[str, List[Rule]] = {}
+    for rule in rules:
+        if rule.group is None:
+            blocks.append([rule])
+        elif rule.group in by_group:
+            by_group[rule.group].append(rule)
+        else:
+            by_group[rule.group] = [rule]
+            blocks.append(by_group[rule.group])
+    return blocks
+
+
+def _literal(value: Any) -> str:
+    if isinstance(value, bool) or isinstance(value, str):
+        return repr(value)
+    if isinstance(value, (int, float)):
+        return repr(float(value))
+    raise RuleError(f"Unsupported literal in rule condition: {value!r}")
+
+
+def condition_source(when: Dict[str, Any]) -> str:
+    """Translate a condition tree into a Python expression over FEATURES"""
+    if "all" in when or "any" in when:
+        key = "all" if "all" in when else "any"
+        parts = when[key]
+        if not isinstance(parts, list) or not parts:
+            raise RuleError(f"'{key}' needs a non-empty list of conditions")
+        joiner = " and " if key == "all" else " or "
+        return "(" + joiner.join(condition_source(part) for part in parts) + ")"
+    if "not" in when:
+        return f"(not {condition_source(when['not'])})"
+
+    feature, op = when.get("feature"), when.get("op")
+    if feature not in FEATURES:
+        raise RuleError(f"Unknown feature: {feature!r}")
+    if op in TRUTH_OPS:
+        return f"({'' if op == 'is_true' else 'not '}{feature})"
+    if op in COMPARISON_OPS:
+        return f"({feature} {COMPARISON_OPS[op]} {_literal(when.get('value'))})"
+    if op in MEMBERSHIP_OPS:
+        values = when.get("value")
+        if not isinstance(values, list) or not values:
+            raise RuleError(f"'{op}' needs a non-empty list value")
+        items = ", ".join(_literal(v) for v in values)
+        return f"({feature} {MEMBERSHIP_OPS[op]} ({items},))"
+    raise RuleError(f"Unknown operator: {op!r}")
+
+
+def _generate_source(rule_set: RuleSet) -> str:
+    lines = [
+        f"def evaluate({', '.join(FEATURES)}):",
+        "    score = 0.0",
+        "    indicators = []",
+    ]
+    for block in rule_set.blocks:
+        for position, rule in enumerate(block):
+            keyword = "if" if position == 0 else "elif"
+            lines.append(f"    {keyword} {condition_source(rule.when)}:  # {rule.id!r}")
+            lines.append(f"        score += {rule.weight!r}")
+            lines.append(f"        indicators.append({rule.indicator!r})")
+    lines.append(f"    if score > {rule_set.max_score!r}:")
+    lines.append(f"        score = {rule_set.max_score!r}")
+    lines.append("    score = round(score, 2)")
+    for band in rule_set.risk_bands:
+        result = f"return score, {band.level!r}, {band.confidence!r}, indicators"
+        if band.below is None:
+            lines.append(f"    {result}")
+        else:
+            lines.append(f"    if score < {band.below!r}:")
+            lines.append(f"        {result}")
+    return "\n".join(lines) + "\n"
+
+
+def _plain_name(value: Any, what: str) -> str:
+    """A rule id or group: a non-empty, single-line string"""
+    if not isinstance(value, str) or not value or not value.isprintable():
+        raise RuleError(f"{what} must be a non-empty single-line string: {value!r}")
+    return value
+
+
+def parse_rule_set(data: Dict[str, Any]) -> RuleSet:
+    """Validate a decoded rule file and compile it"""
+    try:
+        rules = [
+            Rule(
+                id=_plain_name(raw["id"], "Rule id"),
+                when=raw["when"],
+                weight=float(raw["weight"]),
+                indicator=str(raw["indicator"]),
+                group=_plain_name(raw["group"], "Rule group") if raw.get("group") is not None else None,
+            )
+            for raw in data["rules"]
+        ]
+        risk_bands = [
+            RiskBand(
+                below=float(raw["below"]) if "below" in raw else None,
+                level=str(raw["level"]),
+                confidence=float(raw["confidence"]),
+            )
+            for raw in data["risk_bands"]
+        ]
+    except (KeyError, TypeError, ValueError) as e:
+        raise RuleError(f"Malformed rule file: {e}") from e
+
+    ids = [rule.id for rule in rules]
+    if len(set(ids)) != len(ids):
+        raise RuleError("Rule ids must be unique")
+    max_score = float(data.get("max_score", 100))
+    # Scores are rounded to 2 decimals. With finer weights a sum can land on a
+    # half-cent tie, which Python's round() and NumPy's (bulk_scoring) break
+    # differently, so the two paths would disagree.
+    for name, value in [(rule.id, rule.weight) for rule in rules] + [("max_score", max_score)]:
+        if round(value, 2) != value:
+            raise RuleError(f"{name}: {value!r} has more than 2 decimal places")
+    if not risk_bands or risk_bands[-1].below is not None:
+        raise RuleError("The last risk band must be open-ended (no 'below')")
+    if any(band.below is None for band in risk_bands[:-1]):
+        raise RuleError("Only the last risk band may omit 'below'")
+
+    return RuleSet(
+        version=str(data.get("version", "unversioned")),
+        rules=rules,
+        risk_bands=risk_bands,
+        max_score=max_score,
+    )
+
+
+def load_rule_set(path: str) -> RuleSet:
+    with open(path, encoding="utf-8") as f:
+        return parse_rule_set(json.load(f))
+
+
+class RuleEngine:
+    """Holds the active rule set and hot-reloads it when the file changes.
+
+    The file's mtime is checked at most once per reload_interval seconds. A
+    broken edit is logged and the previous rule set stays active.
+    """
+
+    def __init__(self, path: str, reload_interval: float = 5.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._mtime = os.stat(path).st_mtime
+        self._rule_set = load_rule_set(path)
+        self._next_check = time.monotonic() + reload_interval
+        self._lock = threading.Lock()
+
+    @property
+    def rule_set(self) -> RuleSet:
+        if self.reload_interval > 0 and time.monotonic() >= self._next_check:
+            self._check_for_changes()
+        return self._rule_set
+
+    def evaluate(self, *features: Any) -> Evaluation:
+        return self.rule_set.evaluate(*features)
+
+    def _check_for_changes(self) -> None:
+        with self._lock:
+            self._next_check = time.monotonic() + self.reload_interval
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError as e:
+                print(f"Fraud rules unavailable, keeping version {self._rule_set.version}: {e}")
+                return
+            if mtime != self._mtime:
+                self._mtime = mtime
+                self.reload()
+
+    def reload(self) -> bool:
+        """Recompile the rule file; returns False (keeping the old rules) if it is invalid"""
+        try:
+            self._rule_set = load_rule_set(self.path)
+        except (OSError, RuleError, ValueError) as e:
+            print(f"Fraud rules reload failed, keeping version {self._rule_set.version}: {e}")
+            return False
+        return True
@@ -0,0 +1,65 @@
+# api/scoring.py - Rule-based fraud scoring
+import os
+from typing import List, Optional, Tuple
+from models import IncidentData, FraudScore
+from rule_engine import RuleEngine
+from keyword_scanner import KeywordMatch, load_automaton
+from holiday_calendar import load_calendar, parse_timestamp, weekday_of
+
+FRAUD_RULES_PATH = os.getenv(
+    "FRAUD_RULES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "fraud_rules.json")
+)
+FRAUD_RULES_RELOAD_INTERVAL = float(os.getenv("FRAUD_RULES_RELOAD_INTERVAL", "5"))
+
+FRAUD_KEYWORDS_PATH = os.getenv(
+    "FRAUD_KEYWORDS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "fraud_keywords.json")
+)
+
+HOLIDAYS_PATH = os.getenv(
+    "HOLIDAYS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "holidays.json")
+)
+
+fraud_rules = RuleEngine(FRAUD_RULES_PATH, reload_interval=FRAUD_RULES_RELOAD_INTERVAL)
+fraud_keywords = load_automaton(FRAUD_KEYWORDS_PATH)
+fraud_calendar = load_calendar(HOLIDAYS_PATH)
+
+HIGH_RISK_CATEGORY = "high_risk_incident"
+
+def scan_description(description: str) -> List[KeywordMatch]:
+    """Every lexicon phrase found in a description, with its category and weight"""
+    return fraud_keywords.scan(description)
+
+def incident_weekday(date_time: str) -> Optional[int]:
+    """Weekday of an ISO-8601 incident timestamp (Monday=0), or None if unparseable"""
+    parsed = parse_timestamp(date_time)
+    return None if parsed is None else weekday_of(parsed[0])
+
+def incident_timing(incident: IncidentData) -> Tuple[int, bool, bool]:
+    """(weekday, holiday, after_hours) in the incident's province or state; weekday is -1 if unparseable"""
+    return fraud_calendar.timing(incident.dateTime, incident.location)
+
+def extract_features(incident: IncidentData) -> Tuple:
+    """Feature values in rule_engine.FEATURES order"""
+    weekday, holiday, after_hours = incident_timing(incident)
+    return (
+        incident.claimedAmount or 0.0,
+        len(incident.description),
+        fraud_keywords.categories(incident.description).get(HIGH_RISK_CATEGORY, 0.0),
+        weekday,
+        incident.injuries,
+        incident.propertyDamage,
+        len(incident.location),
+        holiday,
+        after_hours,
+    )
+
+def calculate_fraud_score(incident: IncidentData) -> FraudScore:
+    """Calculate fraud risk score using the active declarative rule set"""
+    score, risk_level, confidence, indicators = fraud_rules.evaluate(*extract_features(incident))
+    
+    return FraudScore(
+        score=score,
+        risk_level=risk_level,
+        indicators=indicators,
+        confidence=confidence
+    )
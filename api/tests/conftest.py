@@ -0,0 +1,10 @@
+# api/tests/conftest.py - Make the flat api/ modules (and benchmark helpers) importable
+import os
+import sys
+import tempfile
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [API_DIR, os.path.join(API_DIR, "benchmarks")]
+
+# Modules that import main must not write claims into the shared temp dir
+os.environ.setdefault("CLAIM_STORE_DB", os.path.join(tempfile.mkdtemp(prefix="cortex-tests-"), "claims.db"))
@@ -0,0 +1,116 @@
+# api/tests/test_bulk_scoring.py - Bulk NumPy scoring must match the scalar scorer claim for claim
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import datetime  # noqa: E402
+import json  # noqa: E402
+
+from bulk_scoring import score_incidents, timing_columns, to_fraud_scores  # noqa: E402
+from holiday_calendar import parse_calendar  # noqa: E402
+from models import IncidentData  # noqa: E402
+from rule_engine import RuleError, parse_rule_set  # noqa: E402
+from scoring import HOLIDAYS_PATH, calculate_fraud_score, extract_features, fraud_calendar  # noqa: E402
+from synthetic_claims import generate_claims  # noqa: E402
+
+RISK_BANDS = [
+    {"below": 30, "level": "Low", "confidence": 0.7},
+    {"below": 60, "level": "Medium", "confidence": 0.8},
+    {"level": "High", "confidence": 0.9},
+]
+
+
+def corpus(count: int = 2000):
+    return [IncidentData(**claim) for claim in generate_claims(count, seed=7)]
+
+
+def assert_matches_scalar(incidents, rule_set):
+    for incident, bulk_score in zip(incidents, to_fraud_scores(score_incidents(incidents, rule_set))):
+        score, level, confidence, indicators = rule_set.evaluate(*extract_features(incident))
+        assert (bulk_score.score, bulk_score.risk_level, bulk_score.confidence, bulk_score.indicators) == \
+            (score, level, confidence, indicators)
+
+
+def test_matches_calculate_fraud_score():
+    incidents = corpus()
+    for incident, bulk_score in zip(incidents, to_fraud_scores(score_incidents(incidents))):
+        assert bulk_score == calculate_fraud_score(incident)
+
+
+def test_more_than_64_rules():
+    rules = [
+        {"id": f"amount_over_{i}", "when": {"feature": "claimed_amount", "op": ">", "value": i * 100},
+         "weight": 1, "indicator": f"Amount over {i * 100}"}
+        for i in range(70)
+    ]
+    rule_set = parse_rule_set({"version": "test", "rules": rules, "risk_bands": RISK_BANDS})
+    incidents = corpus(300)
+    assert_matches_scalar(incidents, rule_set)
+    assert any(len(score.indicators) > 64 for score in to_fraud_scores(score_incidents(incidents, rule_set)))
+
+
+def test_fractional_weights():
+    rules = [
+        {"id": "amount", "when": {"feature": "claimed_amount", "op": ">", "value": 3000}, "weight": 29.99,
+         "indicator": "Amount"},
+        {"id": "injuries", "when": {"feature": "injuries", "op": "is_true"}, "weight": 0.01,
+         "indicator": "Injuries"},
+        {"id": "short", "when": {"feature": "description_length", "op": "<", "value": 100}, "weight": 30.01,
+         "indicator": "Short"},
+        {"id": "weekend", "when": {"feature": "weekday", "op": ">=", "value": 5}, "weight": 0.1,
+         "indicator": "Weekend"},
+        {"id": "damage", "when": {"feature": "property_damage", "op": "is_true"}, "weight": 0.2,
+         "indicator": "Damage"},
+    ]
+    rule_set = parse_rule_set({"version": "test", "rules": rules, "risk_bands": RISK_BANDS})
+    assert_matches_scalar(corpus(), rule_set)
+
+
+def test_rejects_weights_finer_than_cents():
+    rules = [{"id": "amount", "when": {"feature": "claimed_amount", "op": ">", "value": 0},
+              "weight": 59.995, "indicator": "Amount"}]
+    with pytest.raises(RuleError):
+        parse_rule_set({"version": "test", "rules": rules, "risk_bands": RISK_BANDS})
+
+
+LOCATIONS = ["Toronto, ON", "Montreal, QC H2X", "Seattle, WA 98101", "Los Angeles, CA", "Austin TX",
+             "PARKING LOT ON MAIN ST", "", "Halifax, NS, Canada"]
+
+
+def timestamps():
+    day = datetime.date(2023, 12, 20)
+    for offset in range(760):
+        date = (day + datetime.timedelta(days=offset)).isoformat()
+        yield f"{date}T{offset % 24:02d}:{offset * 7 % 60:02d}:00"
+        yield date
+    yield from ["2025-12-25Z", "2025-12-25+00:00", "2025-07-01T23:30:00Z", "20251225T0100",
+                "1990-12-25T12:00", "2055-12-25T03:00", "2055-12-25", "not a date", "2025-02-30", ""]
+
+
+@pytest.mark.parametrize("calendar_options", [
+    {},
+    {"first_year": 2024, "last_year": 2025},  # late 2023 and 2026 fall outside the tables
+    {"after_hours": {"start": "09:00", "end": "17:00"}},  # window that does not wrap midnight
+])
+def test_timing_columns_match_scalar_timing(calendar_options):
+    with open(HOLIDAYS_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    options = dict(calendar_options)
+    if "after_hours" in options:
+        data["after_hours"] = options.pop("after_hours")
+    calendar = parse_calendar(data, **options)
+    date_times = list(timestamps())
+    locations = [LOCATIONS[i % len(LOCATIONS)] for i in range(len(date_times))]
+
+    weekdays, holidays, after_hours = timing_columns(date_times, locations, calendar)
+    expected = [calendar.timing(date_time, location) for date_time, location in zip(date_times, locations)]
+    assert [(int(w), bool(h), bool(a)) for w, h, a in zip(weekdays, holidays, after_hours)] == expected
+    assert holidays.any() and after_hours.any() and (weekdays == -1).any()
+
+
+def test_timing_columns_use_the_default_calendar():
+    date_times = ["2025-12-25T23:00", "2025-07-04T12:00"]
+    locations = ["Toronto, ON", "Seattle, WA"]
+    weekdays, holidays, after_hours = timing_columns(date_times, locations)
+    assert list(zip(weekdays.tolist(), holidays.tolist(), after_hours.tolist())) == \
+        [fraud_calendar.timing(d, loc) for d, loc in zip(date_times, locations)]
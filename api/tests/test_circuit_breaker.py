@@ -0,0 +1,118 @@
+# api/tests/test_circuit_breaker.py - Breaker state machine and adaptive deadline, on a fake clock
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock, **overrides):
+    options = dict(window_seconds=60, min_calls=4, error_rate=0.5, open_seconds=30,
+                   half_open_probes=2, timeout_min=2, timeout_max=30, clock=clock)
+    return CircuitBreaker(**{**options, **overrides})
+
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_trips_on_error_rate_within_window():
+    clock = Clock()
+    breaker = make_breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CLOSED  # fewer than min_calls
+
+    clock.now += 61  # those failures age out of the window
+    for failed in (False, False, True, False, True):
+        if failed:
+            breaker.record_failure()
+        else:
+            breaker.record_success(1.0)
+    assert breaker.state == CLOSED  # 2 of 5
+    assert breaker.snapshot()["calls_in_window"] == 5
+
+    breaker.record_failure()  # 3 of 6
+    assert breaker.state == OPEN
+    assert breaker.trips == 1
+
+
+def test_open_rejects_until_open_seconds_pass():
+    clock = Clock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 29.9
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    clock.now += 0.1
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+
+def test_half_open_limits_probes():
+    clock = Clock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 30
+    assert breaker.allow() and breaker.allow()
+    assert not breaker.allow()  # both probe slots taken
+    breaker.record_cancelled()
+    assert breaker.allow()  # a cancelled probe frees its slot
+    assert not breaker.allow()
+
+
+def test_half_open_failure_reopens():
+    clock = Clock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.trips == 2
+    assert not breaker.allow()  # open_seconds restart from the failed probe
+
+
+def test_half_open_success_closes_with_a_clean_window():
+    clock = Clock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success(1.0)
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["calls_in_window"] == 0
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CLOSED  # old failures do not count against the recovered breaker
+
+
+def test_deadline_follows_p99_latency():
+    breaker = make_breaker(Clock())
+    for _ in range(19):
+        breaker.record_success(4.0)
+    assert breaker.deadline() == 30  # too few samples: timeout_max
+    breaker.record_success(4.0)
+    assert breaker.deadline() == 6.0  # 1.5 x p99
+
+    for _ in range(179):
+        breaker.record_success(4.0)
+    breaker.record_success(100.0)
+    assert breaker.deadline() == 6.0  # one outlier in 200 is below p99
+
+
+def test_deadline_is_clamped():
+    breaker = make_breaker(Clock())
+    for _ in range(20):
+        breaker.record_success(0.1)
+    assert breaker.deadline() == 2  # timeout_min
+    for _ in range(500):
+        breaker.record_success(60.0)
+    assert breaker.deadline() == 30  # timeout_max
@@ -0,0 +1,44 @@
+# api/tests/test_claim_ids.py - Claim IDs sort by creation and never repeat
+import time
+
+import claim_ids
+from claim_ids import CLAIM_ID_PREFIX, ClaimIdGenerator, decode_timestamp_ms
+
+
+def test_monotonic_within_one_millisecond(monkeypatch):
+    monkeypatch.setattr(claim_ids.time, "time_ns", lambda: 1_700_000_000_123_456_789)
+    generate = ClaimIdGenerator()
+    ids = [generate() for _ in range(10_000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert {decode_timestamp_ms(claim_id) for claim_id in ids} == {1_700_000_000_123}
+
+
+def test_monotonic_when_the_clock_steps_back(monkeypatch):
+    now = [1_700_000_000_500]
+    monkeypatch.setattr(claim_ids.time, "time_ns", lambda: now[0] * 1_000_000)
+    generate = ClaimIdGenerator()
+    first = generate()
+    now[0] -= 200
+    second = generate()
+    now[0] += 1000
+    third = generate()
+    assert first < second < third
+    assert decode_timestamp_ms(second) == 1_700_000_000_500  # held at the latest time seen
+    assert decode_timestamp_ms(third) == 1_700_000_001_300
+
+
+def test_layout_and_timestamp():
+    generate = ClaimIdGenerator(node=7)
+    before = time.time_ns() // 1_000_000
+    claim_id = generate()
+    after = time.time_ns() // 1_000_000
+    assert claim_id.startswith(CLAIM_ID_PREFIX)
+    assert len(claim_id) == len(CLAIM_ID_PREFIX) + 26
+    assert before <= decode_timestamp_ms(claim_id) <= after
+    assert claim_id[len(CLAIM_ID_PREFIX) + 10:len(CLAIM_ID_PREFIX) + 18] == "00000007"
+
+
+def test_random_nodes_keep_generators_apart():
+    ids = {generate() for generate in (ClaimIdGenerator(), ClaimIdGenerator()) for _ in range(1000)}
+    assert len(ids) == 2000
@@ -0,0 +1,70 @@
+# api/tests/test_claim_store.py - Claims are readable before and after the write-behind flush
+import asyncio
+import threading
+
+from claim_store import ClaimStore
+from models import AIAnalysis, ClaimAnalysisRequest, ClaimAnalysisResponse, FraudScore, IncidentData
+
+REQUEST = ClaimAnalysisRequest(incidentData=IncidentData(
+    location="Toronto, ON", dateTime="2025-03-04T10:00:00", description="Rear-ended at a light.",
+    claimedAmount=1000.0,
+))
+
+
+def response(claim_id: str, status: str = "approved") -> ClaimAnalysisResponse:
+    return ClaimAnalysisResponse(
+        claim_id=claim_id,
+        fraud_score=FraudScore(score=10.0, risk_level="Low", indicators=[], confidence=0.7),
+        ai_analysis=AIAnalysis(validity="valid", recommendation="auto_approve", estimated_payout=850.0,
+                               red_flags=[], reasoning="ok"),
+        status=status,
+        created_at=f"2025-03-04T10:00:0{claim_id[-1]}",
+    )
+
+
+def test_get_and_list_after_flush(tmp_path):
+    store = ClaimStore(str(tmp_path / "claims.db"))
+    for index in range(3):
+        assert store.record(REQUEST, response(f"CLM-{index}"))
+
+    async def scenario():
+        assert (await store.get("CLM-1")).response.claim_id == "CLM-1"  # still pending, from memory
+        store.flush()
+        assert (await store.get("CLM-1")).response.claim_id == "CLM-1"
+        assert await store.get("CLM-9") is None
+        first, cursor = await store.list(limit=2)
+        second, last = await store.list(limit=2, cursor=cursor)
+        flagged, _ = await store.list(status="flagged")
+        assert (await store.load_rollups())["claims"] == 3
+        return [c.response.claim_id for c in first + second], last, flagged
+
+    ids, last, flagged = asyncio.run(scenario())
+    assert ids == ["CLM-2", "CLM-1", "CLM-0"]
+    assert last is None
+    assert flagged == []
+    store.close()
+
+
+def test_reads_run_off_the_event_loop(tmp_path):
+    store = ClaimStore(str(tmp_path / "claims.db"))
+    threads = []
+    original = store._get
+
+    def spy(claim_id):
+        threads.append(threading.current_thread())
+        return original(claim_id)
+
+    store._get = spy
+    asyncio.run(store.get("CLM-0"))
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_unwritable_path_disables_the_store(tmp_path):
+    store = ClaimStore(str(tmp_path / "missing" / "claims.db"))
+    assert not store.record(REQUEST, response("CLM-0"))
+
+    async def scenario():
+        return await store.get("CLM-0"), await store.list(), await store.load_rollups()
+
+    assert asyncio.run(scenario()) == (None, ([], None), None)
+    assert store.stats()["enabled"] is False
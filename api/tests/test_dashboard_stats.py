@@ -0,0 +1,55 @@
+# api/tests/test_dashboard_stats.py - Dashboard totals from the shared rollups, or local counters without them
+import asyncio
+
+from dashboard_stats import DashboardStats
+from models import AIAnalysis, ClaimAnalysisResponse, FraudScore
+
+
+def response(status: str, payout: float = 100.0, risk_level: str = "Low") -> ClaimAnalysisResponse:
+    return ClaimAnalysisResponse(
+        claim_id="CLM-1",
+        fraud_score=FraudScore(score=10.0, risk_level=risk_level, indicators=[], confidence=0.7),
+        ai_analysis=AIAnalysis(validity="valid", recommendation="auto_approve", estimated_payout=payout,
+                               red_flags=[], reasoning="ok"),
+        status=status,
+        created_at="2025-03-04T10:00:00",
+    )
+
+
+def test_local_counters_without_a_shared_source():
+    stats = DashboardStats()
+    stats.record(response("approved"), 0.2)
+    stats.record(response("flagged", risk_level="High"), 0.4)
+    snapshot = asyncio.run(stats.snapshot())
+    assert snapshot["active_claims"] == 2
+    assert snapshot["fraud_detected"] == 1
+    assert snapshot["approval_rate"] == 50.0
+    assert snapshot["total_payout"] == 100.0
+    assert snapshot["processing_time"] == "0.300s"
+    assert snapshot["risk_distribution"] == {"low": 1, "medium": 0, "high": 1}
+
+
+def test_revise_swaps_a_claims_contribution():
+    stats = DashboardStats()
+    stats.record(response("pending_review"), 0.1)
+    stats.revise(response("pending_review"), response("approved", payout=80.0))
+    snapshot = asyncio.run(stats.snapshot())
+    assert snapshot["active_claims"] == 1
+    assert snapshot["approval_rate"] == 100.0
+    assert snapshot["total_payout"] == 80.0
+
+
+def test_shared_source_wins_and_falls_back_when_unavailable():
+    shared = {"claims": 10.0, "status:approved": 4.0, "payout": 400.0, "risk:Medium": 10.0}
+
+    async def source():
+        return shared
+
+    stats = DashboardStats(shared=source)
+    stats.record(response("flagged"), 0.1)
+    snapshot = asyncio.run(stats.snapshot())
+    assert (snapshot["active_claims"], snapshot["fraud_detected"], snapshot["approval_rate"]) == (10, 0, 40.0)
+    assert snapshot["risk_distribution"]["medium"] == 10
+
+    shared = None
+    assert asyncio.run(stats.snapshot())["active_claims"] == 1
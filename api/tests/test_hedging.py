@@ -0,0 +1,47 @@
+# api/tests/test_hedging.py - Hedge delay percentile and the hedge-rate credit cap
+from hedging import HedgePolicy
+
+
+def warmed(max_rate: float = 0.1, **options) -> HedgePolicy:
+    policy = HedgePolicy(max_rate=max_rate, percentile=95, min_samples=20, **options)
+    for latency in range(1, 101):
+        policy.observe(latency / 100.0)
+    return policy
+
+
+def test_disabled_never_hedges():
+    policy = HedgePolicy(max_rate=0)
+    policy.observe(1.0)
+    assert policy.hedge_delay() is None
+
+
+def test_no_delay_before_min_samples():
+    policy = HedgePolicy(max_rate=0.1, min_samples=20)
+    for _ in range(19):
+        policy.observe(1.0)
+    assert policy.hedge_delay() is None
+
+
+def test_delay_is_the_latency_percentile():
+    assert warmed().hedge_delay() == 0.96
+
+
+def test_hedges_at_most_max_rate_of_calls():
+    policy = warmed(max_rate=0.25)
+    hedged = 0
+    for _ in range(1000):
+        policy.hedge_delay()
+        hedged += policy.try_hedge()
+    assert hedged == 250
+    assert policy.skipped == 750
+
+
+def test_idle_credit_is_capped_at_burst():
+    policy = warmed(max_rate=0.1, burst=5.0)
+    for _ in range(1000):
+        policy.hedge_delay()  # calls that finished before their hedge delay
+    hedged = 0
+    for _ in range(20):
+        hedged += policy.try_hedge()
+    assert hedged == 5
+    assert policy.stats()["sent"] == 5
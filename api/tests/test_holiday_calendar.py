@@ -0,0 +1,47 @@
+# api/tests/test_holiday_calendar.py - Regions come only from codes where addresses put them
+import pytest
+
+from holiday_calendar import parse_timestamp
+from scoring import fraud_calendar
+
+CHRISTMAS_2025 = 739610
+
+
+@pytest.mark.parametrize("location, region", [
+    ("123 King St W, Toronto, ON", "CA-ON"),
+    ("Toronto, ON M5V 3L9", "CA-ON"),
+    ("Toronto ON", "CA-ON"),
+    ("Toronto, ON, Canada", "CA-ON"),
+    ("Toronto, ON, CA", "CA-ON"),
+    ("Seattle, WA 98101", "US-WA"),
+    ("Los Angeles, CA, USA", "US-CA"),
+    ("PARKING LOT ON MAIN ST", fraud_calendar.default_region),
+    ("ON the highway, Ottawa", fraud_calendar.default_region),
+])
+def test_region_of(location, region):
+    assert fraud_calendar.region_of(location) == region
+
+
+@pytest.mark.parametrize("text, minute", [
+    ("2025-12-25", -1),
+    ("2025-12-25Z", -1),
+    ("2025-12-25+00:00", -1),
+    ("2025-12-25-05:00", -1),
+    ("20251225", -1),
+    ("2025-12-25T00:00", 0),
+    ("2025-12-25 23:10", 1390),
+    ("2025-12-25T23:00Z", 1380),
+    ("20251225T2300", 1380),
+])
+def test_parse_timestamp(text, minute):
+    assert parse_timestamp(text) == (CHRISTMAS_2025, minute)
+
+
+@pytest.mark.parametrize("text", ["2025-12-25Z", "2025-12-25+00:00"])
+def test_bare_dates_with_offsets_are_not_after_hours(text):
+    assert fraud_calendar.timing(text, "Toronto, ON") == (3, True, False)
+
+
+def test_unparseable_timestamps():
+    assert parse_timestamp("yesterday") is None
+    assert fraud_calendar.timing("yesterday", "Toronto, ON") == (-1, False, False)
@@ -0,0 +1,67 @@
+# api/tests/test_jobs.py - Job lifecycle through both stores, with SQLite kept off the event loop
+import asyncio
+import threading
+
+import pytest
+
+from jobs import JOB_COMPLETED, JOB_FAILED, JOB_QUEUED, InMemoryJobStore, JobRunner, JobStore, SQLiteJobStore
+from models import ClaimJob, FraudScore
+
+FRAUD_SCORE = FraudScore(score=10.0, risk_level="Low", indicators=[], confidence=0.7)
+
+
+def job(claim_id: str) -> ClaimJob:
+    return ClaimJob(claim_id=claim_id, status=JOB_QUEUED, fraud_score=FRAUD_SCORE,
+                    submitted_at="2025-03-04T10:00:00")
+
+
+def test_job_store_is_abstract():
+    with pytest.raises(TypeError):
+        JobStore()
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_jobs_complete_or_fail(kind, tmp_path):
+    store = InMemoryJobStore() if kind == "memory" else SQLiteJobStore(str(tmp_path / "jobs.db"))
+    runner = JobRunner(store, workers=2)
+
+    async def failing():
+        raise RuntimeError("gemini down")
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+            return None
+
+        await runner.submit(job("CLM-1"), blocked)
+        await runner.submit(job("CLM-2"), failing)
+        assert (await store.get("CLM-1")).status in (JOB_QUEUED, "running")
+        release.set()
+        await runner._queue.join()
+        return await store.get("CLM-1"), await store.get("CLM-2"), await store.get("CLM-9")
+
+    done, failed, missing = asyncio.run(scenario())
+    assert done.status == JOB_COMPLETED and done.completed_at is not None
+    assert failed.status == JOB_FAILED and failed.error == "gemini down"
+    assert missing is None
+
+
+def test_sqlite_queries_run_off_the_event_loop(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    threads = []
+    original = store._put
+
+    def spy(claim_job):
+        threads.append(threading.current_thread())
+        original(claim_job)
+
+    store._put = spy
+
+    async def scenario():
+        await store.put(job("CLM-1"))
+        return await store.get("CLM-1")
+
+    assert asyncio.run(scenario()).claim_id == "CLM-1"
+    assert threads and threads[0] is not threading.main_thread()
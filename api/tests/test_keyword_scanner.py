@@ -0,0 +1,28 @@
+# api/tests/test_keyword_scanner.py - The str.find prefilter must find exactly what the full automaton pass finds
+import random
+
+from keyword_scanner import KeywordAutomaton
+from scoring import fraud_keywords
+
+ENTRIES = [
+    ("stolen", "theft", 20), ("total loss", "loss", 20), ("loss", "loss", 5), ("fire", "fire", 20),
+    ("fire damage", "fire", 25), ("wildfire", "fire", 20), ("refire", "fire", 1), ("re", "other", 1),
+    ("o'neil", "other", 1), ("$5", "other", 1),
+]
+WORDS = [
+    "stolen", "STOLEN", "total", "loss", "TOTAL\n  LOSS", "fire", "FIRE", "fires", "firewall", "_fire",
+    "wildfire", "Refire", "rere", "damage", "o'neil", "$5", "5", "x", "-", "\t", "éclair",
+]
+
+
+def test_prefilter_matches_full_scan():
+    automaton = KeywordAutomaton(ENTRIES)
+    rng = random.Random(0)
+    for _ in range(20000):
+        text = "".join(rng.choice(WORDS) + rng.choice(["", " ", ",", "\n"]) for _ in range(rng.randint(0, 12)))
+        assert automaton.scan(text) == automaton.scan_all(text), text
+
+
+def test_word_boundaries_and_compounds():
+    assert [m.phrase for m in fraud_keywords.scan("Wildfire reached the FLOODWATERS")] == ["wildfire", "floodwaters"]
+    assert fraud_keywords.scan("The firewall and the bonfire pit") == []
@@ -0,0 +1,104 @@
+# api/tests/test_llm_parser.py - JSON extraction from free-form Gemini replies
+import json
+
+import pytest
+
+from llm_parser import LLMParseError, extract_json, find_json_object, parse_analysis, parse_batch_analyses
+from models import FraudScore, IncidentData
+
+INCIDENT = IncidentData(location="Toronto, ON", dateTime="2025-03-04T10:00:00",
+                        description="Rear-ended at a light.", claimedAmount=1000.0)
+FRAUD_SCORE = FraudScore(score=35.0, risk_level="Medium", indicators=["Late report"], confidence=0.8)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"validity": "valid"}', {"validity": "valid"}),
+    ('  \n\t{"validity": "valid"}  ', {"validity": "valid"}),
+    ('```json\n{"validity": "valid"}\n```', {"validity": "valid"}),
+    ('Here is my analysis: {"a": {"b": [1, {"c": 2}]}} Hope this helps.', {"a": {"b": [1, {"c": 2}]}}),
+    ('Braces in strings: {"reasoning": "not } really {", "x": 1}', {"reasoning": "not } really {", "x": 1}),
+    ('Escaped quotes: {"reasoning": "said \\"}\\" twice", "x": 1}', {"reasoning": 'said "}" twice', "x": 1}),
+    # A stray brace in prose never closes; the real object after it still decodes
+    ('Use {claim details as given.\n{"validity": "valid"}', {"validity": "valid"}),
+    # An invalid candidate is skipped whole, not retried at its nested braces
+    ('{"a": {"b": 1}, oops} then {"validity": "valid"}', {"validity": "valid"}),
+    ('[{"validity": "valid"}]', {"validity": "valid"}),
+])
+def test_extract_json(text, expected):
+    assert extract_json(text) == expected
+
+
+@pytest.mark.parametrize("text, message", [
+    ("I'm sorry, I can't help with that claim.", "No JSON object"),
+    ('```json\n{"validity": "questionable", "estimated_payout": 12', "No valid JSON object"),
+    ('[1, 2, 3]', "No JSON object"),
+    ("", "No JSON object"),
+])
+def test_extract_json_rejects(text, message):
+    with pytest.raises(LLMParseError, match=message):
+        extract_json(text)
+
+
+def test_find_json_object_span():
+    text = 'x {"a": "}", "b": {"c": 1}} y'
+    begin, end = find_json_object(text)
+    assert text[begin:end] == '{"a": "}", "b": {"c": 1}}'
+    assert find_json_object('{"a": {"b": 1}') is None
+
+
+def test_parse_analysis_defaults_and_cleans_fields():
+    analysis = parse_analysis('{"validity": "valid", "estimated_payout": "$1,200.50", "red_flags": "Late"}',
+                              INCIDENT, FRAUD_SCORE)
+    assert analysis.estimated_payout == 1200.5
+    assert analysis.red_flags == ["Late"]
+    assert analysis.recommendation == "manual_review"
+    assert analysis.reasoning == "AI analysis completed"
+
+
+def test_parse_analysis_rejects_invalid_fields():
+    with pytest.raises(LLMParseError):
+        parse_analysis('{"estimated_payout": "about a thousand"}', INCIDENT, FRAUD_SCORE)
+
+
+CLAIMS = [(INCIDENT, FRAUD_SCORE)] * 3
+
+
+def batch_entry(index, **fields):
+    return {"index": index, "validity": "valid", "recommendation": "auto_approve",
+            "estimated_payout": 900, "red_flags": [], "reasoning": "ok", **fields}
+
+
+def test_parse_batch_analyses_complete():
+    reply = "```json\n" + json.dumps([batch_entry(2), batch_entry(0), batch_entry(1)]) + "\n```"
+    assert sorted(parse_batch_analyses(reply, CLAIMS)) == [0, 1, 2]
+
+
+def test_parse_batch_analyses_keeps_only_usable_entries():
+    reply = json.dumps([
+        batch_entry(0),
+        batch_entry(0, reasoning="repeated index"),
+        batch_entry(7),  # no such claim
+        batch_entry(-1),
+        {"validity": "valid"},  # no index
+        "not an object",
+        batch_entry("2", estimated_payout="unknown"),  # invalid fields
+    ])
+    analyses = parse_batch_analyses(reply, CLAIMS)
+    assert list(analyses) == [0]
+    assert analyses[0].reasoning == "ok"
+
+
+def test_parse_batch_analyses_accepts_string_indexes_and_wrappers():
+    reply = json.dumps({"analyses": [batch_entry("1")]})
+    assert list(parse_batch_analyses(reply, CLAIMS)) == [1]
+
+
+def test_parse_batch_analyses_truncated_reply():
+    reply = json.dumps([batch_entry(0), batch_entry(1)])[:-40]
+    # The array never decodes, so every claim is left for a one-by-one retry
+    assert parse_batch_analyses(reply, CLAIMS) == {}
+
+
+def test_parse_batch_analyses_without_array():
+    with pytest.raises(LLMParseError):
+        parse_batch_analyses('{"validity": "valid"}', CLAIMS)
@@ -0,0 +1,145 @@
+# api/tests/test_llm_scheduler.py - Quota admission, shedding and queue bookkeeping on small RPM buckets
+import asyncio
+
+import pytest
+
+from llm_scheduler import LLMSaturated, LLMScheduler
+
+LOW, MID, HIGH = (1.0, 10.0), (1.0, 50.0), (1.0, 90.0)
+BACKGROUND = (0.0, 90.0)
+
+
+def saturated(rpm: float = 1, **options) -> LLMScheduler:
+    """A scheduler whose request bucket is empty; the next token is 60/rpm seconds away"""
+    scheduler = LLMScheduler(rpm=rpm, **options)
+    scheduler.requests.tokens = 0
+    return scheduler
+
+
+def assert_drained(scheduler: LLMScheduler) -> None:
+    assert scheduler.stats()["queued"] == 0
+    assert scheduler.stats()["queued_background"] == 0
+
+
+async def settle() -> None:
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_admits_immediately_within_quota():
+    scheduler = LLMScheduler(rpm=2)
+
+    async def scenario():
+        await scheduler.acquire(HIGH, 10)
+        await scheduler.acquire(HIGH, 10)
+        assert not scheduler.try_acquire(10)
+
+    asyncio.run(scenario())
+    assert scheduler.admitted == 2
+    assert_drained(scheduler)
+
+
+def test_sheds_interactive_calls_after_max_wait():
+    scheduler = saturated(max_wait=0.05)
+
+    async def scenario():
+        with pytest.raises(LLMSaturated, match="timeout"):
+            await scheduler.acquire(HIGH, 10)
+
+    asyncio.run(scenario())
+    assert scheduler.shed == 1
+    assert_drained(scheduler)
+
+
+def test_full_queue_evicts_lower_priority_call():
+    scheduler = saturated(max_queue=1, max_wait=5)
+
+    async def scenario():
+        low = asyncio.ensure_future(scheduler.acquire(LOW, 10))
+        await settle()
+        high = asyncio.ensure_future(scheduler.acquire(HIGH, 10))
+        await settle()
+        with pytest.raises(LLMSaturated, match="Evicted"):
+            await low
+        assert scheduler.queue_depth == 1
+
+        # Nothing ranks below MID now, so it is shed instead of queued
+        with pytest.raises(LLMSaturated, match="queue_full"):
+            await scheduler.acquire(MID, 10)
+        assert scheduler.queue_depth == 1
+
+        high.cancel()
+        await settle()
+
+    asyncio.run(scenario())
+    assert scheduler.shed == 2
+    assert_drained(scheduler)
+
+
+def test_background_calls_are_never_shed():
+    scheduler = saturated(max_queue=1, max_wait=0.05)
+
+    async def scenario():
+        background = asyncio.ensure_future(scheduler.acquire(BACKGROUND, 10, background=True))
+        await settle()
+        # Background work neither fills max_queue nor is evicted to make room
+        interactive = asyncio.ensure_future(scheduler.acquire(LOW, 10))
+        await asyncio.sleep(0.1)
+        with pytest.raises(LLMSaturated, match="timeout"):
+            await interactive
+        assert not background.done()
+        assert scheduler.stats()["queued_background"] == 1
+        assert scheduler.queue_depth == 1
+
+        background.cancel()
+        await settle()
+
+    asyncio.run(scenario())
+    assert scheduler.shed == 1
+    assert_drained(scheduler)
+
+
+def test_dispatches_interactive_before_background():
+    scheduler = saturated(rpm=600)  # a token every 0.1 s
+    admitted = []
+
+    async def call(name, priority, background=False):
+        await scheduler.acquire(priority, 10, background=background)
+        admitted.append(name)
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(call("background", BACKGROUND, background=True))]
+        await settle()
+        tasks += [asyncio.ensure_future(call("low", LOW)), asyncio.ensure_future(call("high", HIGH))]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert admitted == ["high", "low", "background"]
+    assert scheduler.admitted == 3
+    assert_drained(scheduler)
+
+
+def test_counters_survive_cancel_timeout_and_evict():
+    scheduler = saturated(max_queue=2, max_wait=0.05)
+
+    async def scenario():
+        calls = [
+            asyncio.ensure_future(scheduler.acquire(LOW, 10)),
+            asyncio.ensure_future(scheduler.acquire(MID, 10)),
+            asyncio.ensure_future(scheduler.acquire(BACKGROUND, 10, background=True)),
+        ]
+        await settle()
+        assert scheduler.stats()["queued"] == 3
+        calls.append(asyncio.ensure_future(scheduler.acquire(HIGH, 10)))  # evicts LOW
+        await settle()
+        calls[1].cancel()
+        calls[2].cancel()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        assert isinstance(results[0], LLMSaturated)
+        assert isinstance(results[1], asyncio.CancelledError)
+        assert isinstance(results[2], asyncio.CancelledError)
+        assert isinstance(results[3], LLMSaturated)  # timed out
+
+    asyncio.run(scenario())
+    assert scheduler.shed == 2
+    assert_drained(scheduler)
@@ -0,0 +1,90 @@
+# api/tests/test_main.py - Claim analysis stays fast when the LLM quota is saturated
+import asyncio
+import json
+import time
+
+import main
+from fake_gemini import FakeGenerativeModel
+from llm_cache import LLMResponseCache
+from llm_client import LLMClient
+from llm_scheduler import LLMScheduler
+from models import IncidentData
+from routing import PATH_DEFERRED, ReviewQueue
+from scoring import calculate_fraud_score
+from singleflight import SingleFlight
+from synthetic_claims import generate_claims
+
+MAX_WAIT = 0.2
+
+
+def risky_claim():
+    for claim in generate_claims(200, seed=3):
+        incident = IncidentData(**claim)
+        fraud_score = calculate_fraud_score(incident)
+        if fraud_score.score > 0:
+            return incident, fraud_score
+    raise AssertionError("no claim with a nonzero fraud score")
+
+
+def test_retry_of_deferred_claim_is_not_held_by_its_review(monkeypatch):
+    scheduler = LLMScheduler(rpm=1, max_wait=MAX_WAIT)
+    scheduler.requests.take(1)  # next token is a minute away
+    monkeypatch.setattr(main, "GEMINI_API_KEY", "test")
+    monkeypatch.setattr(main, "llm", LLMClient(FakeGenerativeModel("fixed:1"), scheduler=scheduler),
+                        raising=False)
+    monkeypatch.setattr(main, "llm_cache", LLMResponseCache())
+    monkeypatch.setattr(main, "llm_inflight", SingleFlight())
+    monkeypatch.setattr(main, "review_queue", ReviewQueue())
+    incident, fraud_score = risky_claim()
+
+    async def scenario():
+        first = await main._ai_analyze_claim(incident, fraud_score, "claim-1")
+        assert first.analysis_path == PATH_DEFERRED
+        await asyncio.sleep(0.01)  # the review is now waiting for quota
+        assert scheduler.stats()["queued_background"] == 1
+
+        started = time.monotonic()
+        retry = await asyncio.wait_for(main._ai_analyze_claim(incident, fraud_score, "claim-2"), 5 * MAX_WAIT)
+        assert retry.analysis_path == PATH_DEFERRED
+        assert time.monotonic() - started < 2 * MAX_WAIT
+        await asyncio.sleep(0.01)
+        # The second review joined the first instead of queueing another call
+        assert scheduler.stats()["queued_background"] == 1
+        assert main.llm_inflight.coalesced == 1
+
+    asyncio.run(scenario())
+
+
+def test_stream_stops_reading_while_results_are_unread(monkeypatch):
+    monkeypatch.setattr(main, "STREAM_MAX_IN_FLIGHT", 2)
+    monkeypatch.setattr(main, "STREAM_MAX_BUFFERED", 3)
+    lines = [json.dumps({"incidentData": claim}).encode() + b"\n" for claim in generate_claims(100, seed=5)]
+    read = 0
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/api/claims/analyze:stream", "raw_path": b"/api/claims/analyze:stream",
+        "root_path": "", "query_string": b"", "headers": [(b"content-type", b"application/x-ndjson")],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+
+    async def receive():
+        nonlocal read
+        if read < len(lines):
+            read += 1
+            return {"type": "http.request", "body": lines[read - 1], "more_body": True}
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            await asyncio.Event().wait()  # the client never reads the response
+
+    async def scenario():
+        app = asyncio.ensure_future(main.app(scope, receive, send))
+        await asyncio.sleep(0.5)
+        assert not app.done()
+        app.cancel()
+        await asyncio.gather(app, return_exceptions=True)
+
+    asyncio.run(scenario())
+    # One line sent, three queued, two holding window slots, one waiting for a slot
+    assert read <= 8
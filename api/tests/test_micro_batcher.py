@@ -0,0 +1,82 @@
+# api/tests/test_micro_batcher.py - Calls arriving together share one batch; failures stay per item
+import asyncio
+
+import pytest
+
+from micro_batcher import MicroBatcher
+
+
+def recording(results=None):
+    batches = []
+
+    async def process(items):
+        batches.append(list(items))
+        await asyncio.sleep(0)
+        return results(items) if results else [item * 10 for item in items]
+
+    return batches, process
+
+
+def test_flushes_when_full():
+    batches, process = recording()
+    batcher = MicroBatcher(process, max_size=3, max_wait=60)
+
+    async def scenario():
+        # max_wait is a minute, so only reaching max_size can flush these in time
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(6))), 1)
+
+    assert asyncio.run(scenario()) == [0, 10, 20, 30, 40, 50]
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_flushes_after_max_wait():
+    batches, process = recording()
+    batcher = MicroBatcher(process, max_size=10, max_wait=0.01)
+
+    async def scenario():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2))
+
+    assert asyncio.run(scenario()) == [10, 20]
+    assert batches == [[1, 2]]
+    assert batcher.stats()["avg_batch_size"] == 2.0
+
+
+def test_exception_in_one_slot_reaches_only_that_caller():
+    _, process = recording(lambda items: [ValueError("bad reply") if item == 1 else item for item in items])
+    batcher = MicroBatcher(process, max_size=3, max_wait=60)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    first, second, third = asyncio.run(scenario())
+    assert (first, third) == (0, 2)
+    assert isinstance(second, ValueError)
+
+
+def test_process_failure_reaches_every_caller():
+    async def process(items):
+        raise RuntimeError("gemini down")
+
+    batcher = MicroBatcher(process, max_size=2, max_wait=60)
+
+    async def scenario():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    assert [type(result) for result in asyncio.run(scenario())] == [RuntimeError, RuntimeError]
+
+
+def test_cancelled_caller_does_not_break_the_batch():
+    batches, process = recording()
+    batcher = MicroBatcher(process, max_size=10, max_wait=0.01)
+
+    async def scenario():
+        gone = asyncio.ensure_future(batcher.submit(1))
+        kept = asyncio.ensure_future(batcher.submit(2))
+        await asyncio.sleep(0)
+        gone.cancel()
+        assert await kept == 20
+        with pytest.raises(asyncio.CancelledError):
+            await gone
+
+    asyncio.run(scenario())
+    assert batches == [[1, 2]]
@@ -0,0 +1,43 @@
+# api/tests/test_ndjson.py - NDJSON lines are reassembled across arbitrary chunk boundaries
+import asyncio
+
+from ndjson import iter_ndjson_lines
+
+
+def lines(chunks, max_line_bytes=1024):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [line async for line in iter_ndjson_lines(source(), max_line_bytes)]
+
+    return asyncio.run(collect())
+
+
+def test_lines_split_across_chunks():
+    assert lines([b'{"a"', b': 1}\n{"b": 2', b"}\n"]) == [b'{"a": 1}', b'{"b": 2}']
+
+
+def test_every_split_point_gives_the_same_lines():
+    body = b'{"a": 1}\n\n{"b": 2}\r\n{"c": 3}'
+    for split in range(len(body) + 1):
+        assert lines([body[:split], body[split:]]) == [b'{"a": 1}', b'{"b": 2}\r', b'{"c": 3}']
+
+
+def test_final_line_without_newline():
+    assert lines([b'{"a": 1}\n{"b"', b": 2}"]) == [b'{"a": 1}', b'{"b": 2}']
+
+
+def test_blank_lines_and_empty_chunks_are_skipped():
+    assert lines([b"", b"\n  \n", b'{"a": 1}\n', b"", b"\n"]) == [b'{"a": 1}']
+
+
+def test_oversized_line_reported_once_as_none():
+    big = b"x" * 20
+    assert lines([b'{"a": 1}\n' + big[:8], big[8:], big[:5] + b"\n", b'{"b": 2}\n'], max_line_bytes=10) == \
+        [b'{"a": 1}', None, b'{"b": 2}']
+
+
+def test_oversized_final_line_without_newline():
+    assert lines([b'{"a": 1}\n', b"x" * 11], max_line_bytes=10) == [b'{"a": 1}', None]
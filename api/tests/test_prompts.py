@@ -0,0 +1,59 @@
+# api/tests/test_prompts.py - Prompt templates render like str.format and descriptions fit the token budget
+import pytest
+
+from prompts import ELISION, PromptTemplate, estimate_tokens, trim_description
+
+FILLER = "The weather was clear and traffic was light that morning."
+
+
+def test_template_renders_like_format():
+    text = "Claim {index}: {location} ({index}) costs ${amount}. Braces: {{literal}}"
+    template = PromptTemplate("t1", text)
+    fields = dict(index=3, location="Toronto, ON", amount=1200.5)
+    assert template.render(**fields) == text.format(**fields)
+    assert template.fields == ("index", "location", "amount")
+
+
+@pytest.mark.parametrize("text", ["{amount:.2f}", "{name!r}", "{claim.location}", "{0}"])
+def test_template_rejects_unsupported_placeholders(text):
+    with pytest.raises(ValueError):
+        PromptTemplate("t1", text)
+
+
+def test_short_description_is_untouched():
+    description = "Rear-ended at a light.  Minor damage."
+    assert trim_description(description, token_budget=64) == (description, False)
+    assert trim_description(description * 100, token_budget=0) == (description * 100, False)
+
+
+def test_trim_keeps_first_last_and_flagged_sentences_within_budget():
+    sentences = ["Rear-ended on the highway."] + [FILLER] * 20 + ["The car was stolen later that night."] \
+        + [FILLER] * 20 + ["I reported it the next day."]
+    budget = 40
+    trimmed, truncated = trim_description(" ".join(sentences), token_budget=budget)
+    assert truncated
+    assert len(trimmed) <= budget * 4
+    assert trimmed.startswith("Rear-ended on the highway. [...]")
+    assert trimmed.endswith("I reported it the next day.")
+    assert "The car was stolen later that night." in trimmed
+    assert trimmed.count(FILLER) < 40
+
+
+def test_trim_fills_remaining_budget_in_order():
+    sentences = [f"Sentence number {i} of the report." for i in range(30)]
+    trimmed, _ = trim_description(" ".join(sentences), token_budget=30)
+    kept = [s for s in sentences if s in trimmed]
+    assert kept[:2] == sentences[:2]  # after the first and last, the rest fill from the start
+    assert kept[-1] == sentences[-1]
+    assert ELISION.strip() in trimmed
+
+
+def test_single_long_sentence_keeps_head_and_tail():
+    description = " ".join(f"word{i}" for i in range(500))
+    trimmed, truncated = trim_description(description, token_budget=50)
+    assert truncated
+    assert len(trimmed) <= 50 * 4
+    assert trimmed.startswith("word0 word1 ")
+    assert trimmed.endswith(" word499")
+    assert ELISION in trimmed
+    assert estimate_tokens(trimmed) <= 51
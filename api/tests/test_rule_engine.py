@@ -0,0 +1,40 @@
+# api/tests/test_rule_engine.py - Rule files are validated before anything reaches the compiled evaluator
+import json
+
+import pytest
+
+from rule_engine import RuleEngine, RuleError, parse_rule_set
+
+RISK_BANDS = [{"level": "Low", "confidence": 0.7}]
+INJURIES = {"feature": "injuries", "op": "is_true"}
+
+
+def rule(**overrides):
+    return {"id": "injuries", "when": INJURIES, "weight": 10, "indicator": "Injuries", **overrides}
+
+
+@pytest.mark.parametrize("overrides", [
+    {"id": "injuries\n    score += 99"},
+    {"id": ""},
+    {"group": "timing\nx"},
+    {"group": ["timing"]},
+    {"when": 5},
+    {"when": {"all": [1]}},
+])
+def test_rejects_malformed_rules(overrides):
+    with pytest.raises(RuleError):
+        parse_rule_set({"rules": [rule(**overrides)], "risk_bands": RISK_BANDS})
+
+
+def test_quotes_in_ids_compile():
+    rule_set = parse_rule_set({"rules": [rule(id="it's \"fine\"")], "risk_bands": RISK_BANDS})
+    assert rule_set.evaluate(0.0, 100, 0.0, 0, True, False, 10, False, False)[0] == 10.0
+
+
+def test_bad_reload_keeps_previous_rules(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"version": "good", "rules": [rule()], "risk_bands": RISK_BANDS}))
+    engine = RuleEngine(str(path), reload_interval=0)
+    path.write_text(json.dumps({"version": "bad", "rules": [rule(when={"all": [1]})], "risk_bands": RISK_BANDS}))
+    assert engine.reload() is False
+    assert engine.rule_set.version == "good"
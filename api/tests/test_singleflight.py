@@ -0,0 +1,77 @@
+# api/tests/test_singleflight.py - Concurrent identical calls share one flight, failures included
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+async def settle() -> None:
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_followers_share_the_leader_result():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"answer": 42}
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+
+def test_leader_failure_reaches_every_follower():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("gemini down")
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("key", failing) for _ in range(3)), return_exceptions=True)
+        assert [type(result) for result in results] == [RuntimeError] * 3
+        # The failed flight is forgotten, so the next call starts afresh
+        assert flight.in_flight == 0
+        with pytest.raises(RuntimeError):
+            await flight.do("key", failing)
+
+    asyncio.run(scenario())
+    assert flight.leaders == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_flight():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do("key", work))
+        await settle()
+        follower = asyncio.ensure_future(flight.do("key", work))
+        await settle()
+        leader.cancel()
+        assert await follower == "done"
+
+    asyncio.run(scenario())
+
+
+def test_distinct_keys_run_separately():
+    flight = SingleFlight()
+
+    async def scenario():
+        return await asyncio.gather(flight.do("a", lambda: asyncio.sleep(0, "a")),
+                                    flight.do("b", lambda: asyncio.sleep(0, "b")))
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+    assert flight.leaders == 2